@@ -1,27 +1,50 @@
 # app/__init__.py
 
 import os
+import sqlite3
 from flask import Flask, render_template, request, jsonify, redirect, url_for
+from jinja2 import FileSystemBytecodeCache
 from config import Config
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from flask_migrate import Migrate
-from flask_login import LoginManager, current_user
+from flask_login import LoginManager
 from flask_mail import Mail
 from flask_wtf.csrf import CSRFProtect
 # --- Flask-Admin এর জন্য নতুন ইম্পোর্ট ---
 from flask_admin import Admin
-from flask_admin.contrib.sqla import ModelView
+from app.cache import TTLCache, FragmentCacheExtension
+from app.compress import Compress
+from app.ratelimit import RateLimiter
+from app.passwords import PasswordHasher
+from app.profiler import RequestProfiler
+from werkzeug.middleware.proxy_fix import ProxyFix
 
 db = SQLAlchemy()
 migrate = Migrate()
 login = LoginManager()
 mail = Mail()
 csrf = CSRFProtect()
+compress = Compress()
+limiter = RateLimiter()
+password_hasher = PasswordHasher()
+profiler = RequestProfiler()
 # --- অ্যাডমিন অবজেক্ট তৈরি করা ---
 admin = Admin(name='XForum Admin', template_mode='bootstrap4')
+user_cache = TTLCache()
+fragment_cache = TTLCache()
 
 login.login_view = 'auth.login'
 
+@event.listens_for(Engine, 'connect')
+def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    # SQLite ডিফল্টভাবে foreign key মানে না, ON DELETE CASCADE কাজ করার জন্য এটি চালু করতে হয়
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA foreign_keys=ON')
+        cursor.close()
+
 @login.unauthorized_handler
 def unauthorized_callback():
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
@@ -33,41 +56,60 @@ def unauthorized_callback():
 def create_app(config_class=Config):
     app = Flask(__name__, instance_relative_config=True)
     app.config.from_object(config_class)
+    if app.config['PROXY_FIX_X_FOR']:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_FIX_X_FOR'], x_proto=1)
     app.jinja_env.add_extension('jinja2.ext.do')
+    app.jinja_env.add_extension(FragmentCacheExtension)
 
     try:
         os.makedirs(app.instance_path)
     except OSError:
         pass
 
+    if app.config['JINJA_BYTECODE_CACHE']:
+        bytecode_dir = os.path.join(app.instance_path, 'jinja_cache')
+        os.makedirs(bytecode_dir, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(bytecode_dir)
+    fragment_cache.configure(maxsize=app.config['FRAGMENT_CACHE_SIZE'], ttl=app.config['FRAGMENT_CACHE_TTL'])
+    app.jinja_env.fragment_cache = fragment_cache
+
     db.init_app(app)
-    migrate.init_app(app, db)
+    # SQLite ALTER TABLE দিয়ে constraint বদলাতে পারে না, তাই batch মোডে মাইগ্রেশন তৈরি হবে
+    migrate.init_app(app, db, render_as_batch=True)
     login.init_app(app)
+    password_hasher.init_app(app)
     mail.init_app(app)
+    # CSRF যাচাইয়ের আগেই অতিরিক্ত রিকোয়েস্ট ফিরিয়ে দেওয়া হয়
+    limiter.init_app(app)
     csrf.init_app(app)
+    compress.init_app(app)
+    profiler.init_app(app)
+    user_cache.configure(maxsize=app.config['USER_CACHE_SIZE'], ttl=app.config['USER_CACHE_TTL'])
+
+    from app import assets
+    assets.init_app(app)
     # --- অ্যাপের সাথে অ্যাডমিন প্যানেল যুক্ত করা ---
     admin.init_app(app)
 
     # ব্লুপ্রিন্ট রেজিস্টার করার আগে মডেল ইম্পোর্ট করা ভালো অভ্যাস
     from app import models
 
-    # --- একটি কাস্টম ModelView তৈরি করা যা অ্যাক্সেস কন্ট্রোল করবে ---
-    class AdminModelView(ModelView):
-        def is_accessible(self):
-            # শুধুমাত্র লগইন করা এবং is_admin ফ্ল্যাগ True থাকা ব্যবহারকারীরাই অ্যাক্সেস পাবে
-            return current_user.is_authenticated and hasattr(current_user, 'is_admin') and current_user.is_admin
-
-        def inaccessible_callback(self, name, **kwargs):
-            # যদি অ্যাক্সেস না থাকে, তাহলে হোমপেজে পাঠিয়ে দেওয়া হবে
-            return redirect(url_for('main.index'))
+    from app.admin_views import (
+        AdminModelView, UserAdminView, PostAdminView, CommentAdminView, VoteAdminView, NotificationAdminView,
+        CacheStatsView, JobStateAdminView, ProfilesView, ExportView
+    )
 
     # --- আমাদের মডেলগুলোর জন্য অ্যাডমিন প্যানেলে ভিউ যোগ করা ---
-    admin.add_view(AdminModelView(models.User, db.session))
-    admin.add_view(AdminModelView(models.Post, db.session))
-    admin.add_view(AdminModelView(models.Comment, db.session))
+    admin.add_view(UserAdminView(models.User, db.session))
+    admin.add_view(PostAdminView(models.Post, db.session))
+    admin.add_view(CommentAdminView(models.Comment, db.session))
     admin.add_view(AdminModelView(models.Category, db.session))
-    admin.add_view(AdminModelView(models.Vote, db.session))
-    admin.add_view(AdminModelView(models.Notification, db.session))
+    admin.add_view(VoteAdminView(models.Vote, db.session))
+    admin.add_view(NotificationAdminView(models.Notification, db.session))
+    admin.add_view(JobStateAdminView(models.JobState, db.session, name='Jobs'))
+    admin.add_view(CacheStatsView(name='Cache Stats', endpoint='cache_stats'))
+    admin.add_view(ProfilesView(name='Profiles', endpoint='profiles'))
+    admin.add_view(ExportView(name='Export', endpoint='export'))
 
     # --- ব্লুপ্রিন্ট রেজিস্টার করা ---
     from app.auth import bp as auth_bp
@@ -76,4 +118,13 @@ def create_app(config_class=Config):
     from app.main import bp as main_bp
     app.register_blueprint(main_bp)
 
+    from app.cli import bp as cli_bp
+    app.register_blueprint(cli_bp)
+
+    from app import jobs
+    jobs.init_app(app)
+
+    from app.suggest import suggest_index
+    suggest_index.init_app(app)
+
     return app
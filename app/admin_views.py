@@ -0,0 +1,191 @@
+# app/admin_views.py
+
+import re
+
+from datetime import datetime, timezone
+
+from flask import (
+    Response, abort, current_app, flash, redirect, request, send_from_directory, stream_with_context, url_for
+)
+from flask_admin import BaseView, expose
+from flask_admin.actions import action
+from flask_admin.contrib.sqla import ModelView
+from flask_login import current_user
+from sqlalchemy import func
+from sqlalchemy.orm import Query
+
+from app import fragment_cache, profiler, user_cache
+from app.export import EXPORT_TABLES, iter_ndjson, parse_since
+from app.moderation import delete_comments, delete_posts, purge_users
+
+
+class CappedCountQuery(Query):
+    """Count query that stops counting after ``count_cap`` rows.
+
+    Flask-Admin applies list filters to this query with ``.filter()`` and then
+    calls ``.scalar()``, so the cap survives filtering and the list page never
+    runs an unbounded COUNT over the whole table.
+    """
+    count_cap = 10000
+
+    def scalar(self):
+        capped = self.limit(self.count_cap).subquery()
+        return self.session.query(func.count()).select_from(capped).scalar()
+
+
+class AdminAccessMixin:
+    def is_accessible(self):
+        # শুধুমাত্র লগইন করা এবং is_admin ফ্ল্যাগ True থাকা ব্যবহারকারীরাই অ্যাক্সেস পাবে
+        return current_user.is_authenticated and hasattr(current_user, 'is_admin') and current_user.is_admin
+
+    def inaccessible_callback(self, name, **kwargs):
+        # যদি অ্যাক্সেস না থাকে, তাহলে হোমপেজে পাঠিয়ে দেওয়া হবে
+        return redirect(url_for('main.index'))
+
+
+class AdminModelView(AdminAccessMixin, ModelView):
+    pass
+
+
+class JobStateAdminView(AdminModelView):
+    can_create = False
+    can_edit = False
+    column_display_pk = True
+    column_list = ('name', 'last_status', 'last_started_at', 'last_duration', 'run_count', 'last_result_json')
+    column_default_sort = 'name'
+
+
+class CacheStatsView(AdminAccessMixin, BaseView):
+    @expose('/')
+    def index(self):
+        caches = {
+            'Logged-in users': user_cache.stats(),
+            'Template fragments': fragment_cache.stats(),
+        }
+        return self.render('admin/cache_stats.html', caches=caches)
+
+
+class ProfilesView(AdminAccessMixin, BaseView):
+    formats = {'pstats': '.prof', 'collapsed': '.collapsed'}
+
+    @expose('/')
+    def index(self):
+        return self.render('admin/profiles.html', profiles=profiler.profiles(),
+                           query_arg=current_app.config['PROFILER_QUERY_ARG'],
+                           header=current_app.config['PROFILER_HEADER'])
+
+    @expose('/<profile_id>/<fmt>')
+    def download(self, profile_id, fmt):
+        if fmt not in self.formats or not re.fullmatch(r'[\w-]+', profile_id):
+            abort(404)
+        return send_from_directory(profiler.directory, profile_id + self.formats[fmt], as_attachment=True)
+
+
+class LargeTableModelView(AdminModelView):
+    """Admin view for tables that grow to millions of rows.
+
+    Sorting is restricted to indexed columns, counts are capped and
+    relationships are never joined into the list query.
+    """
+    page_size = 50
+    can_set_page_size = True
+    column_display_pk = True
+    count_cap = 10000
+
+    def get_count_query(self):
+        query = CappedCountQuery(self.model.id, session=self.session)
+        query.count_cap = self.count_cap
+        return query
+
+
+class UserAdminView(AdminModelView):
+    # is_admin বা confirmed বদলালে লগইন ক্যাশ থেকে পুরোনো কপি সরিয়ে দেওয়া হয়
+    def after_model_change(self, form, model, is_created):
+        user_cache.invalidate(model.id)
+
+    def delete_model(self, model):
+        # ORM দিয়ে মুছলে পোস্ট ও কমেন্ট রয়ে যায়; purge_users সব একসাথে মুছে ফেলে
+        self.on_model_delete(model)
+        purge_users([model.id])
+        self.after_model_delete(model)
+        return True
+
+    def after_model_delete(self, model):
+        user_cache.invalidate(model.id)
+
+    @action('purge', 'Purge user and all content',
+            'Delete the selected users with all of their posts, comments, votes and notifications?')
+    def action_purge(self, ids):
+        user_ids = [int(user_id) for user_id in ids if int(user_id) != current_user.id]
+        counts = purge_users(user_ids)
+        flash(
+            f"Purged {counts.get('users', 0)} user(s), {counts.get('posts', 0)} post(s), "
+            f"{counts.get('comments', 0)} comment(s) and {counts.get('votes', 0)} vote(s).",
+            'success'
+        )
+
+
+class PostAdminView(AdminModelView):
+    def delete_model(self, model):
+        self.on_model_delete(model)
+        delete_posts([model.id])
+        self.after_model_delete(model)
+        return True
+
+    @action('delete', 'Delete', 'Are you sure you want to delete selected records?')
+    def action_delete(self, ids):
+        count = delete_posts(int(post_id) for post_id in ids)
+        flash(f'{count} post(s) were successfully deleted.', 'success')
+
+
+class CommentAdminView(AdminModelView):
+    def delete_model(self, model):
+        self.on_model_delete(model)
+        delete_comments([model.id])
+        self.after_model_delete(model)
+        return True
+
+    @action('delete', 'Delete', 'Are you sure you want to delete selected records?')
+    def action_delete(self, ids):
+        count = delete_comments(int(comment_id) for comment_id in ids)
+        flash(f'{count} comment(s) were successfully deleted.', 'success')
+
+
+class VoteAdminView(LargeTableModelView):
+    column_list = ('id', 'user_id', 'post_id', 'vote_type')
+    column_sortable_list = ('id',)
+    column_default_sort = ('id', True)
+    column_filters = ('user_id', 'post_id', 'vote_type')
+
+
+class NotificationAdminView(LargeTableModelView):
+    column_list = ('id', 'user_id', 'name', 'timestamp')
+    column_sortable_list = ('id', 'timestamp')
+    column_default_sort = ('timestamp', True)
+    column_filters = ('user_id',)
+
+
+class ExportView(AdminAccessMixin, BaseView):
+    @expose('/')
+    def index(self):
+        return self.render('admin/export.html', tables=EXPORT_TABLES)
+
+    @expose('/download')
+    def download(self):
+        tables = [name for name in request.args.getlist('tables') if name in EXPORT_TABLES]
+        # খালি তালিকা iter_ndjson এর কাছে "সব টেবিল", তাই এখানেই থামানো হয়
+        if not tables:
+            flash('Select at least one table to export.', 'error')
+            return redirect(url_for('.index'))
+        since = request.args.get('since', '').strip()
+        try:
+            since = parse_since(since) if since else None
+        except ValueError:
+            flash(f'"{since}" is not a valid ISO 8601 time.', 'error')
+            return redirect(url_for('.index'))
+        exported_at = datetime.now(timezone.utc)
+        filename = f'xforum-{exported_at:%Y%m%d-%H%M%S}{"-delta" if since else ""}.ndjson'
+        # পাসওয়ার্ড হ্যাশ ওয়েব থেকে কখনো ডাউনলোড হয় না; পূর্ণ রিস্টোরের জন্য `flask export --with-password-hashes`
+        chunks = iter_ndjson(tables, since, exported_at=exported_at)
+        return Response(stream_with_context(chunks), mimetype='application/x-ndjson',
+                        headers={'Content-Disposition': f'attachment; filename={filename}'})
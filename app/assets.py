@@ -0,0 +1,45 @@
+# app/assets.py
+
+import hashlib
+import os
+
+from flask import current_app, request, url_for
+
+# filename -> (mtime, content hash)
+_hashes = {}
+
+
+def _content_hash(path):
+    mtime = os.path.getmtime(path)
+    cached = _hashes.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, 'rb') as f:
+        digest = hashlib.md5(f.read()).hexdigest()[:12]
+    _hashes[path] = (mtime, digest)
+    return digest
+
+
+def static_url(filename):
+    """url_for('static') with a content hash, so the file can be cached forever."""
+    path = os.path.join(current_app.static_folder, filename)
+    try:
+        version = _content_hash(path)
+    except OSError:
+        return url_for('static', filename=filename)
+    return url_for('static', filename=filename, v=version)
+
+
+def _cache_versioned_static(response):
+    # হ্যাশ করা URL কখনো বদলায় না, তাই ব্রাউজার এক বছর ক্যাশ রাখতে পারে
+    if request.endpoint == 'static' and request.args.get('v') and response.status_code == 200:
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = 31536000
+        response.cache_control.immutable = True
+    return response
+
+
+def init_app(app):
+    app.jinja_env.globals['static_url'] = static_url
+    app.after_request(_cache_versioned_static)
@@ -5,7 +5,7 @@ from flask_login import login_user, logout_user, current_user, login_required
 from app.auth import bp
 from app.auth.forms import LoginForm, RegistrationForm
 from app.models import User
-from app import db, mail
+from app import db, mail, user_cache
 from flask_mail import Message
 
 @bp.route('/login', methods=['GET', 'POST'])
@@ -18,6 +18,9 @@ def login():
         if user is None or not user.check_password(form.password.data):
             flash('Invalid username or password', 'danger')
             return redirect(url_for('auth.login'))
+        if user.upgrade_password_hash(form.password.data):
+            db.session.commit()
+            user_cache.invalidate(user.id)
         if not user.confirmed:
             flash('Please confirm your email first! A new confirmation link has been sent.', 'warning')
             # যদি ইউজার লগইন করার চেষ্টা করে কিন্তু ইমেইল কনফার্ম না থাকে,
@@ -90,6 +93,7 @@ def confirm_email(token):
     else:
         user.confirmed = True
         db.session.commit()
+        user_cache.invalidate(user.id)
         flash('Your email has been confirmed! You can now log in.', 'success')
         
     return redirect(url_for('auth.login'))
@@ -0,0 +1,138 @@
+# app/cli.py
+
+import os
+from datetime import datetime, timezone
+
+import click
+from flask import Blueprint, current_app
+from sqlalchemy import bindparam, inspect
+
+from app import db
+from app.models import JobState, Post, make_excerpt
+from app.compress import precompress_static
+from app.export import EXPORT_TABLES, iter_ndjson, parse_since
+
+bp = Blueprint('cli', __name__, cli_group=None)
+
+
+@bp.cli.command('create-indexes')
+def create_indexes():
+    """Create model indexes missing from a database that migrations do not manage.
+
+    Deploys get their indexes from `flask db upgrade`. This is a manual repair
+    tool, e.g. for a database copied from an old db.create_all() setup.
+    """
+    inspector = inspect(db.engine)
+    tables = set(inspector.get_table_names())
+    for table in db.metadata.sorted_tables:
+        if table.name not in tables:
+            continue
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            index.create(db.engine)
+            click.echo(f'Created {index.name}')
+
+
+@bp.cli.command('backfill-excerpts')
+@click.option('--batch-size', default=500, show_default=True)
+def backfill_excerpts(batch_size):
+    """Fill Post.excerpt for rows created before the column existed.
+
+    Only rows whose excerpt is still NULL are touched, so running it again
+    is a no-op. Run it by hand once after ``flask db upgrade``.
+    """
+    post_table = Post.__table__
+    set_excerpt = (
+        post_table.update()
+        .where(post_table.c.id == bindparam('post_id'))
+        .values(excerpt=bindparam('new_excerpt'), version_id=post_table.c.version_id + 1)
+    )
+    last_id, updated = 0, 0
+    while True:
+        rows = db.session.execute(
+            db.select(Post.id, Post.content)
+            .where(Post.id > last_id, Post.excerpt.is_(None))
+            .order_by(Post.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        db.session.execute(set_excerpt, [
+            {'post_id': post_id, 'new_excerpt': make_excerpt(content)} for post_id, content in rows
+        ])
+        db.session.commit()
+        last_id = rows[-1].id
+        updated += len(rows)
+    click.echo(f'Updated {updated} excerpts.')
+
+
+@bp.cli.command('compress-static')
+def compress_static():
+    """Write .gz/.br copies of static text assets so they are served without per-request compression."""
+    results = precompress_static(current_app.static_folder, current_app.config['COMPRESS_MIN_SIZE'])
+    for path, size, compressed_size, encoding in results:
+        name = os.path.relpath(path, current_app.static_folder)
+        click.echo(f'{name} [{encoding}]: {size} -> {compressed_size} bytes')
+    click.echo(f'{len(results)} compressed files up to date.')
+
+
+@bp.cli.group('jobs')
+def jobs_group():
+    """Run or inspect the periodic maintenance jobs."""
+
+
+@jobs_group.command('list')
+def list_jobs():
+    """Show every registered job and when it last ran."""
+    from app.jobs import JOBS
+    for name, registered in JOBS.items():
+        state = db.session.get(JobState, name)
+        if state is None or state.last_finished_at is None:
+            click.echo(f'{name} (every {registered.interval}s): never run')
+            continue
+        ran_at = datetime.fromtimestamp(state.last_finished_at, timezone.utc).isoformat(timespec='seconds')
+        click.echo(f'{name} (every {registered.interval}s): {state.last_status} at {ran_at}, '
+                   f'{state.last_duration:.2f}s, {state.last_result_json}')
+
+
+@jobs_group.command('run')
+@click.argument('names', nargs=-1)
+@click.option('--force', is_flag=True, help='Run even if the job is not due yet.')
+def run_jobs(names, force):
+    """Run the due jobs, or only NAMES if given. Meant to be called from cron."""
+    from app.jobs import JOBS, run_job
+    unknown = [name for name in names if name not in JOBS]
+    if unknown:
+        raise click.BadParameter(', '.join(unknown), param_hint='NAMES')
+    for name in names or JOBS:
+        result = run_job(JOBS[name], force=force)
+        click.echo(f'{name}: {"skipped (not due or running elsewhere)" if result is None else result}')
+
+
+@bp.cli.command('export')
+@click.argument('tables', nargs=-1, type=click.Choice(list(EXPORT_TABLES)))
+@click.option('--since', help='ISO 8601 time; only export rows created, changed or deleted since then.')
+@click.option('--state-file', type=click.Path(dir_okay=False),
+              help='Read --since from this file and store the new export time in it afterwards.')
+@click.option('-o', '--output', type=click.File('w', encoding='utf-8'), default='-', show_default=True)
+@click.option('--batch-size', default=1000, show_default=True)
+@click.option('--with-password-hashes', is_flag=True, help='Include password hashes (full restore).')
+def export(tables, since, state_file, output, batch_size, with_password_hashes):
+    """Stream users, posts, comments and votes (or only TABLES) as NDJSON."""
+    if since is None and state_file and os.path.exists(state_file):
+        with open(state_file) as f:
+            since = f.read().strip() or None
+    try:
+        since = parse_since(since) if since else None
+    except ValueError:
+        raise click.BadParameter(f'{since!r} is not an ISO 8601 time', param_hint='--since')
+    exported_at = datetime.now(timezone.utc)
+    for chunk in iter_ndjson(tables, since, batch_size, with_password_hashes, exported_at):
+        output.write(chunk)
+    output.flush()
+    # এক্সপোর্ট সম্পূর্ণ হলেই শুধু পরের delta র শুরুর সময় সংরক্ষণ করা হয়
+    if state_file:
+        with open(state_file, 'w') as f:
+            f.write(exported_at.isoformat())
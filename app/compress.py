@@ -0,0 +1,181 @@
+# app/compress.py
+
+import gzip
+import mimetypes
+import os
+import zlib
+
+from flask import request, send_from_directory
+from werkzeug.security import safe_join
+
+try:
+    import brotli
+except ImportError:  # Brotli ঐচ্ছিক; না থাকলে শুধু gzip ব্যবহার হবে
+    brotli = None
+
+# যেসব ফাইল আগেই কম্প্রেস করা (ছবি ইত্যাদি) সেগুলো আবার কম্প্রেস করে লাভ নেই
+PRECOMPRESS_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.html', '.txt', '.map')
+_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+
+class _GzipStream:
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def process(self, data):
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class _BrotliStream:
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def process(self, data):
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class Compress:
+    """gzip/Brotli response compression with Accept-Encoding negotiation.
+
+    Rendered responses above ``COMPRESS_MIN_SIZE`` bytes are compressed in
+    ``after_request``; streamed responses are compressed chunk by chunk and
+    flushed, so they keep streaming. Static files are never compressed per
+    request: if ``flask compress-static`` has written a ``.br``/``.gz``
+    sibling, that file is served instead.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        if app.config['COMPRESS_ENABLED']:
+            app.before_request(self._serve_precompressed_static)
+            app.after_request(self._compress_response)
+
+    @staticmethod
+    def available_encodings():
+        return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+    def negotiate(self, encodings=None):
+        """Pick the client's preferred encoding among ``encodings`` (Brotli wins ties)."""
+        best, best_quality = None, 0
+        for encoding in encodings or self.available_encodings():
+            quality = request.accept_encodings.quality(encoding)
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
+
+    def _serve_precompressed_static(self):
+        if request.endpoint != 'static' or request.method not in ('GET', 'HEAD'):
+            return None
+        filename = request.view_args.get('filename', '')
+        static_folder = self.app.static_folder
+        source = safe_join(static_folder, filename)
+        if source is None or not os.path.isfile(source):
+            return None
+        candidates = []
+        for encoding in self.available_encodings():
+            path = source + _SUFFIXES[encoding]
+            # সোর্স ফাইল বদলানোর পর পুরোনো কম্প্রেস করা কপি পাঠানো হবে না
+            if os.path.isfile(path) and os.path.getmtime(path) >= os.path.getmtime(source):
+                candidates.append(encoding)
+        encoding = self.negotiate(candidates) if candidates else None
+        if encoding is None:
+            return None
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        response = send_from_directory(static_folder, filename + _SUFFIXES[encoding], mimetype=mimetype)
+        response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        return response
+
+    def _compress_response(self, response):
+        config = self.app.config
+        if (response.mimetype not in config['COMPRESS_MIMETYPES']
+                or response.status_code < 200
+                or response.status_code in (204, 206, 304)
+                or response.direct_passthrough
+                or 'Content-Encoding' in response.headers):
+            return response
+        response.vary.add('Accept-Encoding')
+
+        if not response.is_streamed and len(response.get_data()) < config['COMPRESS_MIN_SIZE']:
+            return response
+        encoding = self.negotiate()
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = _compress_stream(response.response, self._stream_compressor(encoding))
+            response.headers.pop('Content-Length', None)
+        else:
+            response.set_data(self.compress_bytes(response.get_data(), encoding))
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def _stream_compressor(self, encoding):
+        if encoding == 'br':
+            return _BrotliStream(self.app.config['COMPRESS_BROTLI_QUALITY'])
+        return _GzipStream(self.app.config['COMPRESS_GZIP_LEVEL'])
+
+    def compress_bytes(self, data, encoding):
+        if encoding == 'br':
+            return brotli.compress(data, quality=self.app.config['COMPRESS_BROTLI_QUALITY'])
+        return gzip.compress(data, compresslevel=self.app.config['COMPRESS_GZIP_LEVEL'], mtime=0)
+
+
+def _compress_stream(chunks, compressor):
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            data = compressor.process(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+def precompress_static(static_folder, min_size=500):
+    """Write ``.gz`` (and ``.br`` if Brotli is installed) next to every text asset.
+
+    A compressed copy is only kept when it is smaller than the original, and
+    it is rewritten only when the source file is newer. Returns a list of
+    ``(path, original_size, compressed_size, encoding)`` tuples.
+    """
+    results = []
+    for root, _, files in os.walk(static_folder):
+        for name in files:
+            if not name.endswith(PRECOMPRESS_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            size = os.path.getsize(path)
+            if size < min_size:
+                continue
+            with open(path, 'rb') as f:
+                data = f.read()
+            for encoding in Compress.available_encodings():
+                target = path + _SUFFIXES[encoding]
+                if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(path):
+                    results.append((path, size, os.path.getsize(target), encoding))
+                    continue
+                if encoding == 'br':
+                    compressed = brotli.compress(data, quality=11)
+                else:
+                    compressed = gzip.compress(data, compresslevel=9, mtime=0)
+                if len(compressed) >= size:
+                    continue
+                with open(target, 'wb') as f:
+                    f.write(compressed)
+                results.append((path, size, len(compressed), encoding))
+    return results
@@ -0,0 +1,111 @@
+# app/export.py
+"""Streaming NDJSON export of forum content for backups.
+
+The stream starts with a ``{"table": "_meta", ...}`` line carrying the
+export time, followed by one ``{"table": ..., "data": {...}}`` line per row,
+tables in foreign-key order. Passing that export time as ``since`` to the
+next export gives only the rows created or changed in between. A delta
+also lists the rows deleted since then, as
+``{"table": ..., "deleted": {"id": ..., "deleted_at": ...}}`` lines ahead of
+that table's rows, so a consumer applies them first (SQLite may hand a
+deleted id to a new row). Deletions are recorded by database triggers in
+``deleted_row`` and kept for ``DELETED_ROWS_KEEP_DAYS``; a delta from
+further back misses older deletions and should be a full export instead.
+
+Rows are read in keyset batches of ``batch_size`` and each batch ends its
+read transaction, so memory stays flat however large a table is and a long
+export never holds SQLite's shared lock against the forum's writers.
+"""
+import json
+from datetime import datetime, timezone
+
+from sqlalchemy import select, tuple_
+
+from app import db
+from app.models import Comment, DeletedRow, Post, User, Vote
+
+EXPORT_TABLES = {'users': User, 'posts': Post, 'comments': Comment, 'votes': Vote}
+SECRET_COLUMNS = {'password_hash'}
+
+
+def parse_since(value):
+    """Parse an ISO 8601 timestamp into the naive UTC datetime the models store."""
+    since = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if since.tzinfo is not None:
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+    return since
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        # মডেলগুলো UTC সময় timezone ছাড়া রাখে
+        return (value if value.tzinfo else value.replace(tzinfo=timezone.utc)).isoformat()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def _keyset_batches(stmt, order_by, batch_size, start=None):
+    """Run ``stmt`` page by page from ``start``, continuing after the last row's ``order_by`` values."""
+    stmt = stmt.order_by(*order_by).limit(batch_size)
+    # পরের পেজে শুধু row-value শর্ত; start আবার যোগ করলে SQLite প্রতি পেজে start থেকেই ইনডেক্স পড়ে
+    condition = start
+    while True:
+        page = stmt if condition is None else stmt.where(condition)
+        rows = db.session.execute(page).mappings().all()
+        db.session.rollback()
+        if not rows:
+            return
+        yield [dict(row) for row in rows]
+        condition = tuple_(*order_by) > tuple_(*(rows[-1][column.name] for column in order_by))
+
+
+def iter_batches(name, since=None, batch_size=1000, include_secrets=False):
+    """Yield lists of row dicts from one table, by id or, for a delta, by change time."""
+    table = EXPORT_TABLES[name].__table__
+    columns = [column for column in table.c if include_secrets or column.name not in SECRET_COLUMNS]
+    if since is None:
+        return _keyset_batches(select(*columns), [table.c.id], batch_size)
+    # ix_<table>_updated_at এ rowid ও থাকে, তাই (updated_at, id) ক্রম ইনডেক্স থেকেই আসে
+    return _keyset_batches(select(*columns), [table.c.updated_at, table.c.id], batch_size,
+                           start=table.c.updated_at >= since)
+
+
+def iter_deletions(name, since, batch_size=1000):
+    """Yield lists of ``{'id', 'deleted_at'}`` dicts for rows of one table deleted since ``since``."""
+    deleted = DeletedRow.__table__
+    stmt = select(deleted.c.id, deleted.c.row_id, deleted.c.deleted_at).where(
+        deleted.c.table_name == EXPORT_TABLES[name].__tablename__
+    )
+    # trigger এর ঘড়ি মিলিসেকেন্ড পর্যন্ত, তাই since এর একই মিলিসেকেন্ডের মুছে ফেলাও ধরা হয়
+    since = since.replace(microsecond=since.microsecond - since.microsecond % 1000)
+    # একই স্টেটমেন্টে মোছা সারিগুলোর deleted_at একই, তাই পেজ বাড়তে থাকা id দিয়ে হয়;
+    # trigger id ও সময় একসাথে বাড়ায়, তাই শুরুর id টা ix_deleted_row_deleted_at থেকেই আসে
+    first_id = (
+        select(deleted.c.id).where(deleted.c.deleted_at >= since)
+        .order_by(deleted.c.deleted_at, deleted.c.id).limit(1).scalar_subquery()
+    )
+    batches = _keyset_batches(stmt, [deleted.c.id], batch_size, start=deleted.c.id >= first_id)
+    for batch in batches:
+        yield [{'id': row['row_id'], 'deleted_at': row['deleted_at']} for row in batch]
+
+
+def iter_ndjson(tables=None, since=None, batch_size=1000, include_secrets=False, exported_at=None):
+    """Yield the export as NDJSON text, one chunk per batch."""
+    tables = [name for name in EXPORT_TABLES if not tables or name in tables]
+    exported_at = exported_at or datetime.now(timezone.utc)
+    yield json.dumps({
+        'table': '_meta',
+        'exported_at': exported_at.isoformat(),
+        'since': _json_default(since) if since else None,
+        'tables': tables,
+    }) + '\n'
+    for name in tables:
+        if since is not None:
+            for batch in iter_deletions(name, since, batch_size):
+                yield ''.join(
+                    json.dumps({'table': name, 'deleted': row}, default=_json_default) + '\n' for row in batch
+                )
+        for batch in iter_batches(name, since, batch_size, include_secrets):
+            yield ''.join(
+                json.dumps({'table': name, 'data': row}, default=_json_default, ensure_ascii=False) + '\n'
+                for row in batch
+            )
@@ -0,0 +1,329 @@
+# app/jobs.py
+"""Periodic maintenance jobs that run off the request path.
+
+Jobs are registered with ``@job(name, interval)`` and executed either by
+``flask jobs run`` (e.g. from cron) or by the optional in-process scheduler
+thread (``JOBS_SCHEDULER_ENABLED``). Each job's last run is stored in the
+``job_state`` table; a lease on that row makes sure only one gunicorn worker
+runs a given job at a time.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased
+
+from app import db
+from app.models import Category, DeletedRow, JobState, Notification, Post, SiteStat, User, Vote
+
+JOBS = {}
+SITE_STATS_KEY = 'home_sidebar'
+
+
+@dataclass
+class Job:
+    name: str
+    func: object
+    interval: int
+
+
+def job(name, interval):
+    """Register a maintenance function to run every ``interval`` seconds."""
+    def decorator(func):
+        JOBS[name] = Job(name, func, interval)
+        return func
+    return decorator
+
+
+def _ensure_state(name):
+    if db.session.get(JobState, name) is None:
+        try:
+            db.session.add(JobState(name=name, run_count=0))
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+
+
+def _claim(job, force):
+    """Take the lease for ``job`` if it is due and no other worker holds it."""
+    _ensure_state(job.name)
+    now = time.time()
+    conditions = [
+        JobState.name == job.name,
+        or_(JobState.lease_until.is_(None), JobState.lease_until < now),
+    ]
+    if not force:
+        conditions.append(or_(JobState.last_finished_at.is_(None),
+                              JobState.last_finished_at <= now - job.interval))
+    result = db.session.execute(
+        update(JobState).where(*conditions).values(
+            lease_until=now + current_app.config['JOBS_LEASE_SECONDS'],
+            last_started_at=now,
+            last_status='running',
+        )
+    )
+    db.session.commit()
+    return result.rowcount == 1
+
+
+def run_job(job, force=False):
+    """Run one job if it is due; returns its result dict, or None if skipped."""
+    if not _claim(job, force):
+        return None
+    started = time.perf_counter()
+    try:
+        result = job.func() or {}
+        status = 'ok'
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.exception('Job %s failed', job.name)
+        result = {'error': str(e)}
+        status = 'error'
+    db.session.execute(
+        update(JobState).where(JobState.name == job.name).values(
+            last_finished_at=time.time(),
+            last_status=status,
+            last_duration=time.perf_counter() - started,
+            last_result_json=json.dumps(result),
+            run_count=JobState.run_count + 1,
+            lease_until=None,
+        )
+    )
+    db.session.commit()
+    return result
+
+
+def run_due_jobs(force=False):
+    results = {}
+    for name, registered in JOBS.items():
+        result = run_job(registered, force=force)
+        if result is not None:
+            results[name] = result
+    return results
+
+
+def _scheduler_loop(app):
+    poll_interval = app.config['JOBS_POLL_INTERVAL']
+    while True:
+        time.sleep(poll_interval)
+        with app.app_context():
+            try:
+                run_due_jobs()
+            except Exception:
+                app.logger.exception('Job scheduler tick failed')
+            finally:
+                db.session.remove()
+
+
+def init_app(app):
+    if not app.config['JOBS_SCHEDULER_ENABLED'] or app.testing:
+        return
+    lock = threading.Lock()
+
+    # প্রথম রিকোয়েস্টে শুরু হয়, তাই `flask db upgrade` এর মতো CLI কমান্ড শিডিউলার চালায় না
+    @app.before_request
+    def _start_scheduler():
+        if 'job_scheduler' in app.extensions:
+            return
+        with lock:
+            if 'job_scheduler' not in app.extensions:
+                thread = threading.Thread(target=_scheduler_loop, args=(app,), name='job-scheduler', daemon=True)
+                thread.start()
+                app.extensions['job_scheduler'] = thread
+
+
+# ------------------------------
+# Maintenance jobs
+# ------------------------------
+def _upload_dir(folder):
+    return os.path.join(current_app.root_path, 'static/uploads', folder)
+
+
+def _unreferenced_files(folder, referenced, grace_seconds):
+    upload_dir = _upload_dir(folder)
+    if not os.path.isdir(upload_dir):
+        return []
+    cutoff = time.time() - grace_seconds
+    orphans = []
+    for name in os.listdir(upload_dir):
+        path = os.path.join(upload_dir, name)
+        # সদ্য আপলোড হওয়া ফাইলের পোস্ট হয়তো এখনো commit হয়নি, তাই grace period
+        if name in referenced or name == 'default.jpg' or not os.path.isfile(path):
+            continue
+        if os.path.getmtime(path) < cutoff:
+            orphans.append(path)
+    return orphans
+
+
+@job('sweep-orphaned-uploads', interval=6 * 3600)
+def sweep_orphaned_uploads():
+    """Delete uploaded files that no post or profile references anymore."""
+    grace = current_app.config['JOBS_UPLOAD_GRACE_SECONDS']
+    post_images = set(db.session.scalars(select(Post.image).where(Post.image.is_not(None))))
+    profile_pictures = set(db.session.scalars(select(User.profile_picture).where(User.profile_picture.is_not(None))))
+    removed = (_unreferenced_files('posts', post_images, grace)
+               + _unreferenced_files('profiles', profile_pictures, grace))
+    freed, count = 0, 0
+    for path in removed:
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            # dedupe-post-images বা delete_posts এর মধ্যে মুছে ফেলেছে
+            continue
+        freed += size
+        count += 1
+    return {'removed': count, 'bytes_freed': freed}
+
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(65536), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@job('dedupe-post-images', interval=24 * 3600)
+def dedupe_post_images():
+    """Point posts with byte-identical images at a single file and delete the copies.
+
+    The file kept is always one a post already uses. sweep-orphaned-uploads
+    may be running at the same time with a list of referenced files it read
+    earlier; pointing posts at a file it saw as an orphan would let it
+    delete the only copy left.
+
+    Profile pictures are left alone: they are named after the user and are
+    replaced in place by ``save_picture``.
+    """
+    upload_dir = _upload_dir('posts')
+    if not os.path.isdir(upload_dir):
+        return {'duplicates': 0, 'bytes_freed': 0}
+
+    cutoff = time.time() - current_app.config['JOBS_UPLOAD_GRACE_SECONDS']
+    by_size = {}
+    for name in sorted(os.listdir(upload_dir)):
+        path = os.path.join(upload_dir, name)
+        if os.path.isfile(path) and os.path.getmtime(path) < cutoff:
+            by_size.setdefault(os.path.getsize(path), []).append(name)
+
+    keeper = aliased(Post)
+    duplicates, freed = 0, 0
+    for size, names in by_size.items():
+        # একই সাইজের ফাইল না থাকলে হ্যাশ করার দরকার নেই
+        if len(names) < 2:
+            continue
+        by_hash = {}
+        for name in names:
+            by_hash.setdefault(_file_hash(os.path.join(upload_dir, name)), []).append(name)
+        for group in by_hash.values():
+            if len(group) < 2:
+                continue
+            referenced = set(db.session.scalars(select(Post.image).where(Post.image.in_(group))))
+            # কোনো পোস্ট ব্যবহার না করলে পুরো গ্রুপটি sweep-orphaned-uploads এর কাজ
+            if not referenced:
+                continue
+            canonical = min(referenced)
+            copies = [name for name in group if name != canonical]
+            # canonical ব্যবহার করা পোস্ট এর মধ্যে মুছে গেলে (delete_posts ফাইলটিও সরায়) কিছু বদলানো হয় না
+            still_used = select(keeper.id).where(keeper.image == canonical).exists()
+            db.session.execute(
+                update(Post).where(Post.image.in_(copies), still_used).values(image=canonical),
+                execution_options={'synchronize_session': False},
+            )
+            db.session.commit()
+            in_use = set(db.session.scalars(select(Post.image).where(Post.image.in_(copies))))
+            for name in copies:
+                if name in in_use:
+                    continue
+                try:
+                    os.remove(os.path.join(upload_dir, name))
+                except FileNotFoundError:
+                    continue
+                duplicates += 1
+                freed += size
+    return {'duplicates': duplicates, 'bytes_freed': freed}
+
+
+@job('prune-notifications', interval=3600)
+def prune_notifications():
+    """Keep only the newest NOTIFICATIONS_PER_USER notifications of every user."""
+    ranked = select(
+        Notification.id,
+        func.row_number().over(
+            partition_by=Notification.user_id,
+            order_by=(Notification.timestamp.desc(), Notification.id.desc()),
+        ).label('rank'),
+    ).subquery()
+    doomed = select(ranked.c.id).where(ranked.c.rank > current_app.config['NOTIFICATIONS_PER_USER'])
+    result = db.session.execute(
+        delete(Notification).where(Notification.id.in_(doomed)),
+        execution_options={'synchronize_session': False},
+    )
+    db.session.commit()
+    return {'deleted': result.rowcount}
+
+
+@job('prune-deleted-rows', interval=24 * 3600)
+def prune_deleted_rows():
+    """Forget deletions older than DELETED_ROWS_KEEP_DAYS; deltas reaching further back need a full export."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=current_app.config['DELETED_ROWS_KEEP_DAYS'])
+    result = db.session.execute(
+        delete(DeletedRow).where(DeletedRow.deleted_at < cutoff.replace(tzinfo=None)),
+        execution_options={'synchronize_session': False},
+    )
+    db.session.commit()
+    return {'deleted': result.rowcount}
+
+
+def compute_site_stats():
+    """Sidebar statistics for the home page, computed with aggregate queries."""
+    post_counts = (
+        select(Post.author_id, func.count(Post.id).label('post_count'))
+        .group_by(Post.author_id).subquery()
+    )
+    like_counts = (
+        select(Post.author_id, func.count(Vote.id).label('likes'))
+        .join(Vote, Vote.post_id == Post.id)
+        .where(Vote.vote_type == 'like')
+        .group_by(Post.author_id).subquery()
+    )
+    posts = func.coalesce(post_counts.c.post_count, 0)
+    likes = func.coalesce(like_counts.c.likes, 0)
+    points = posts * 2 + likes
+    top_rows = db.session.execute(
+        select(User.username, posts, likes, points)
+        .outerjoin(post_counts, post_counts.c.author_id == User.id)
+        .outerjoin(like_counts, like_counts.c.author_id == User.id)
+        .order_by(points.desc(), User.id)
+        .limit(5)
+    ).all()
+    category_counts = db.session.execute(
+        select(Category.id, func.count(Post.id))
+        .outerjoin(Post, Post.category_id == Category.id)
+        .group_by(Category.id)
+    ).all()
+    return {
+        'total_posts': db.session.scalar(select(func.count(Post.id))),
+        'category_counts': {str(category_id): count for category_id, count in category_counts},
+        'top_contributors': [
+            {'username': username, 'post_count': post_count,
+             'total_likes_received': like_count, 'total_points': total_points}
+            for username, post_count, like_count, total_points in top_rows
+        ],
+    }
+
+
+@job('refresh-site-stats', interval=300)
+def refresh_site_stats():
+    stats = compute_site_stats()
+    SiteStat.set_value(SITE_STATS_KEY, stats)
+    db.session.commit()
+    return {'total_posts': stats['total_posts']}
@@ -9,13 +9,20 @@ from app.main.forms import (
     PostForm, EditProfileForm, CommentForm, EmptyForm,
     SearchForm, ChangePasswordForm, RequestResetForm, ResetPasswordForm
 )
-from app import db, mail
+from app import db, mail, user_cache
 from flask_mail import Message
-from app.models import Post, Category, User, Comment, Vote, Notification
+from app.models import Post, Category, User, Comment, Vote, Notification, SiteStat
+from app.jobs import SITE_STATS_KEY, compute_site_stats
+from app.moderation import delete_posts
+from app.suggest import suggest_index
 import json
 from sqlalchemy import or_
+from sqlalchemy.orm import selectinload, defer
 from datetime import datetime, timezone
 
+# লিস্টিং পেজে শুধু excerpt দেখানো হয়; content লোড করার চেষ্টা করলে এরর হবে যাতে ভুল ধরা পড়ে
+LISTING_OPTIONS = (defer(Post.content, raiseload=True),)
+
 @bp.before_app_request
 def before_request():
     g.search_form = SearchForm()
@@ -51,7 +58,7 @@ def index():
     idea_category = next((c for c in all_categories if c.name.lower() == 'idea'), None)
     story_categories = [c for c in all_categories if c.name.lower() != 'idea']
 
-    query = db.select(Post).order_by(Post.created_at.desc())
+    query = db.select(Post).options(*LISTING_OPTIONS).order_by(Post.created_at.desc())
 
     if not category_id_str and idea_category:
         category_id_str = str(idea_category.id)
@@ -68,14 +75,16 @@ def index():
 
     posts = db.paginate(query, page=page, per_page=current_app.config['POSTS_PER_PAGE'], error_out=False)
 
-    total_posts = db.session.scalar(db.select(db.func.count(Post.id)))
-    all_users = db.session.scalars(db.select(User)).all()
-    top_contributors = sorted(all_users, key=lambda u: u.total_points, reverse=True)[:5]
+    # সাইডবারের পরিসংখ্যান refresh-site-stats জব আগে থেকে হিসাব করে রাখে
+    sidebar = SiteStat.get_value(SITE_STATS_KEY, max_age=current_app.config['SITE_STATS_MAX_AGE'])
+    if sidebar is None:
+        sidebar = compute_site_stats()
 
     stats = {
-        'total_posts': total_posts,
+        'total_posts': sidebar['total_posts'],
         'categories': all_categories,
-        'top_contributors': top_contributors
+        'category_counts': sidebar['category_counts'],
+        'top_contributors': sidebar['top_contributors']
     }
 
     return render_template(
@@ -96,7 +105,7 @@ def search():
     if g.search_form:
         g.search_form.q.data = query
     page = request.args.get('page', 1, type=int)
-    search_query = db.select(Post).join(Post.author).filter(
+    search_query = db.select(Post).options(*LISTING_OPTIONS).join(Post.author).filter(
         or_(
             Post.title.ilike(f'%{query}%'),
             Post.content.ilike(f'%{query}%'),
@@ -106,6 +115,24 @@ def search():
     posts = db.paginate(search_query, page=page, per_page=current_app.config['POSTS_PER_PAGE'], error_out=False)
     return render_template('search_results.html', title=f'Search Results for "{query}"', posts=posts, query=query)
 
+@bp.route('/search/suggest')
+def search_suggest():
+    query = request.args.get('q', '', type=str)
+    matches = suggest_index.lookup(query, current_app.config['SUGGEST_LIMIT'])
+    response = jsonify({
+        'query': query,
+        'posts': [{'title': title, 'url': url_for('main.post_detail', post_id=post_id)}
+                  for post_id, title in matches['post']],
+        'users': [{'username': username, 'url': url_for('main.user_profile', username=username)}
+                  for _, username in matches['user']],
+        'categories': [{'name': name, 'url': url_for('main.index', category_id=category_id)}
+                       for category_id, name in matches['category']],
+    })
+    # ফলাফল ইউজারভেদে আলাদা নয়, তাই একই প্রিফিক্স ব্রাউজার/প্রক্সি ক্যাশ থেকে আসতে পারে
+    response.cache_control.public = True
+    response.cache_control.max_age = current_app.config['SUGGEST_CACHE_SECONDS']
+    return response
+
 @bp.route('/vote/<int:post_id>/<string:vote_type>', methods=['POST'])
 @login_required
 def vote(post_id, vote_type):
@@ -136,7 +163,7 @@ def user_profile(username):
     if user is None:
         abort(404)
     page = request.args.get('page', 1, type=int)
-    posts_query = db.select(Post).where(Post.author == user).order_by(Post.created_at.desc())
+    posts_query = db.select(Post).options(*LISTING_OPTIONS).where(Post.author == user).order_by(Post.created_at.desc())
     posts = db.paginate(posts_query, page=page, per_page=current_app.config['POSTS_PER_PAGE'], error_out=False)
     return render_template('user_profile.html', user=user, posts=posts, title=f"{user.username}'s Profile")
 
@@ -175,13 +202,12 @@ def post_detail(post_id):
                         'comment_id': comment.id
                     })
             db.session.commit()
-            comment_html = render_template('_comment.html', comment=comment, post=post, form=form, current_user=current_user)
+            comment_html = render_template('_comment.html', comment=comment, current_user=current_user)
             return jsonify({'status': 'success', 'comment_html': comment_html, 'parent_id': parent_id})
         else:
             return jsonify({'status': 'error', 'message': 'Invalid form data'}), 400
-    comments = db.session.scalars(
-        db.select(Comment).where(Comment.post_id == post_id, Comment.parent_id.is_(None)).order_by(Comment.created_at.asc())
-    ).all()
+    # পুরো থ্রেড ও লেখকেরা দুটি কোয়েরিতে আসে, রেন্ডারের সময় কোনো lazy load হয় না
+    comments = Comment.load_thread(post_id)
     return render_template('post_detail.html', title=post.title, post=post, form=form, comments=comments)
 
 @bp.route('/create_post', methods=['GET', 'POST'])
@@ -227,8 +253,7 @@ def delete_post(post_id):
     post = db.get_or_404(Post, post_id)
     if post.author != current_user:
         abort(403)
-    db.session.delete(post)
-    db.session.commit()
+    delete_posts([post.id])
     flash('Post has been deleted.', 'success')
     next_page = request.args.get('next') or url_for('main.index')
     return redirect(next_page)
@@ -246,6 +271,7 @@ def edit_profile():
             picture_file = save_picture(form.profile_picture.data, current_user.id)
             current_user.profile_picture = picture_file
         db.session.commit()
+        user_cache.invalidate(current_user.id)
         flash('Your profile has been updated successfully!', 'success')
         return redirect(url_for('main.user_profile', username=current_user.username))
     return render_template('edit_profile.html', title='Edit Profile', form=form)
@@ -257,6 +283,7 @@ def change_password():
     if form.validate_on_submit():
         current_user.set_password(form.new_password.data)
         db.session.commit()
+        user_cache.invalidate(current_user.id)
         flash('Your password has been changed successfully!', 'success')
         return redirect(url_for('main.user_profile', username=current_user.username))
     return render_template('change_password.html', title='Change Password', form=form)
@@ -286,6 +313,7 @@ def reset_token(token):
     if form.validate_on_submit():
         user.set_password(form.password.data)
         db.session.commit()
+        user_cache.invalidate(user.id)
         flash('Your password has been updated! You are now able to log in.', 'success')
         return redirect(url_for('auth.login'))
     return render_template('reset_token.html', title='Reset Password', form=form)
@@ -300,6 +328,7 @@ def notifications():
     
     current_user.last_notification_read_time = time.time()
     db.session.commit()
+    user_cache.invalidate(current_user.id)
     
     return render_template('notifications.html', notifications=notifications)
 
@@ -1,30 +1,39 @@
 from datetime import datetime, timezone
 from typing import Optional
+import os
+import re
 import time
 import json
 
 from flask import current_app, url_for
+from markupsafe import Markup
 from flask_login import UserMixin
 from itsdangerous import URLSafeTimedSerializer
-from werkzeug.security import generate_password_hash, check_password_hash
-from sqlalchemy import Integer, String, Text, DateTime, ForeignKey, Boolean
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import DDL, Integer, String, Text, DateTime, ForeignKey, Boolean, event, inspect
+from sqlalchemy.orm import Mapped, mapped_column, relationship, make_transient_to_detached, selectinload, validates
+from sqlalchemy.orm.attributes import set_committed_value
 
-from app import db, login
+from app import db, login, user_cache, password_hasher
 
 # ------------------------------
 # Vote Model
 # ------------------------------
 class Vote(db.Model):
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
-    user_id: Mapped[int] = mapped_column(ForeignKey('user.id'), nullable=False)
-    post_id: Mapped[int] = mapped_column(ForeignKey('post.id'), nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
+    post_id: Mapped[int] = mapped_column(ForeignKey('post.id', ondelete='CASCADE'), nullable=False)
     vote_type: Mapped[str] = mapped_column(String(10), nullable=False)
+    # ইনক্রিমেন্টাল এক্সপোর্ট (flask export --since) এই কলাম দিয়ে পরিবর্তিত সারি খোঁজে
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), index=True)
 
     user: Mapped["User"] = relationship()
     post: Mapped["Post"] = relationship(back_populates="votes")
 
-    __table_args__ = (db.UniqueConstraint('user_id', 'post_id', name='_user_post_uc'),)
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'post_id', name='_user_post_uc'),
+        # likes/dislikes গণনা এবং total_likes_received এর জন্য
+        db.Index('ix_vote_post_id_vote_type', 'post_id', 'vote_type'),
+    )
 
 
 # ------------------------------
@@ -38,6 +47,7 @@ class User(UserMixin, db.Model):
     bio: Mapped[Optional[str]] = mapped_column(Text)
     profile_picture: Mapped[Optional[str]] = mapped_column(String(120), default='default.jpg')
     created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), index=True)
     confirmed: Mapped[bool] = mapped_column(Boolean, default=False)
     telegram_link: Mapped[Optional[str]] = mapped_column(String(120))
     last_notification_read_time: Mapped[Optional[float]] = mapped_column(db.Float)
@@ -45,14 +55,21 @@ class User(UserMixin, db.Model):
 
     posts: Mapped[list["Post"]] = relationship(back_populates="author")
     comments: Mapped[list["Comment"]] = relationship(back_populates="author")
-    notifications: Mapped[list["Notification"]] = relationship(back_populates="user", cascade="all, delete-orphan")
+    notifications: Mapped[list["Notification"]] = relationship(back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
 
     # Password methods
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
+
+    def upgrade_password_hash(self, password):
+        """পুরোনো পদ্ধতি/খরচে করা হ্যাশ বর্তমান সেটিংসে আবার হ্যাশ করে; বদলালে True ফেরত দেয়।"""
+        if not password_hasher.needs_rehash(self.password_hash):
+            return False
+        self.set_password(password)
+        return True
 
     # Token methods
     def get_confirmation_token(self, expires_sec=1800):
@@ -89,8 +106,23 @@ class User(UserMixin, db.Model):
 
     # Profile picture URL
     def profile_picture_url(self):
+        # একজন লেখকের অনেক কমেন্ট একই User অবজেক্ট শেয়ার করে, তাই ফাইল stat অবজেক্ট প্রতি একবার হয়
+        cached = self.__dict__.get('_profile_picture_url')
+        if cached is not None and cached[0] == self.profile_picture:
+            return cached[1]
+        url = self._build_profile_picture_url()
+        self._profile_picture_url = (self.profile_picture, url)
+        return url
+
+    def _build_profile_picture_url(self):
         if self.profile_picture and self.profile_picture != 'default.jpg':
-            return url_for('static', filename=f'uploads/profiles/{self.profile_picture}', _external=False) + f'?v={int(time.time())}'
+            # ফাইলের mtime দিয়ে ভার্সন, যাতে ছবি না বদলালে URL একই থাকে এবং ক্যাশ করা যায়
+            path = os.path.join(current_app.static_folder, 'uploads/profiles', self.profile_picture)
+            try:
+                version = int(os.path.getmtime(path))
+            except OSError:
+                version = 0
+            return url_for('static', filename=f'uploads/profiles/{self.profile_picture}', _external=False) + f'?v={version}'
         return url_for('static', filename='uploads/profiles/default.jpg')
 
     # Notification count
@@ -113,18 +145,7 @@ class User(UserMixin, db.Model):
         ).delete()
         n = Notification(name=name, payload_json=json.dumps(data), user=self)
         db.session.add(n)
-
-        notification_count = db.session.scalar(
-            db.select(db.func.count(Notification.id)).where(Notification.user_id == self.id)
-        )
-        if notification_count > 150:
-            oldest_notification = db.session.scalars(
-                db.select(Notification)
-                .where(Notification.user_id == self.id)
-                .order_by(Notification.timestamp.asc())
-            ).first()
-            if oldest_notification:
-                db.session.delete(oldest_notification)
+        # পুরোনো নোটিফিকেশন ছাঁটাই এখন prune-notifications জবে হয়, রিকোয়েস্টের সময় নয়
         return n
 
     # --- নতুন প্রোপার্টি ---
@@ -155,9 +176,29 @@ class User(UserMixin, db.Model):
         return post_points + like_points
 
 
+    # Login cache helpers
+    def cache_snapshot(self):
+        """Plain column values that can be kept across requests and sessions."""
+        return {attr.key: getattr(self, attr.key) for attr in inspect(User).column_attrs}
+
+    @staticmethod
+    def from_cache_snapshot(values):
+        """Attach a cached snapshot to the current session without a SELECT."""
+        user = User(**values)
+        make_transient_to_detached(user)
+        return db.session.merge(user, load=False)
+
+
 @login.user_loader
 def load_user(id):
-    return db.session.get(User, int(id))
+    user_id = int(id)
+    values = user_cache.get(user_id)
+    if values is not None:
+        return User.from_cache_snapshot(values)
+    user = db.session.get(User, user_id)
+    if user is not None:
+        user_cache.set(user_id, user.cache_snapshot())
+    return user
 
 
 # ------------------------------
@@ -172,7 +213,9 @@ class Category(db.Model):
     @property
     def post_count(self):
         """এই ক্যাটাগরিতে মোট পোস্ট সংখ্যা রিটার্ন করে।"""
-        return len(self.posts)
+        return db.session.scalar(
+            db.select(db.func.count(Post.id)).where(Post.category_id == self.id)
+        )
 
     def __repr__(self):
         return f"<Category {self.name}>"
@@ -181,19 +224,51 @@ class Category(db.Model):
 # ------------------------------
 # Post Model
 # ------------------------------
+EXCERPT_LENGTH = 200
+_BLOCK_BOUNDARY = re.compile(r'<(br|/p|/div|/li|/h[1-6])\b', re.IGNORECASE)
+
+
+def make_excerpt(content):
+    """HTML কন্টেন্ট থেকে ট্যাগ ছাড়া প্রথম EXCERPT_LENGTH অক্ষর।"""
+    # প্যারাগ্রাফ বা লাইন শেষে একটি স্পেস রাখা হয়, নাহলে শব্দগুলো জোড়া লেগে যায়
+    text = _BLOCK_BOUNDARY.sub(r' <\1', content or '')
+    return Markup(text).striptags()[:EXCERPT_LENGTH]
+
+
 class Post(db.Model):
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     title: Mapped[str] = mapped_column(String(100), index=True, nullable=False)
     content: Mapped[str] = mapped_column(Text, nullable=False)
+    # লিস্টিং পেজের জন্য আগে থেকে তৈরি করা plain-text অংশ, যাতে পুরো content লোড করতে না হয়;
+    # NULL মানে এখনো তৈরি হয়নি (`flask backfill-excerpts`), '' মানে পোস্টে কোনো লেখা নেই
+    excerpt: Mapped[Optional[str]] = mapped_column(String(EXCERPT_LENGTH))
     created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), index=True)
     image: Mapped[Optional[str]] = mapped_column(String(120))
-    author_id: Mapped[int] = mapped_column(ForeignKey('user.id'), nullable=False)
+    author_id: Mapped[int] = mapped_column(ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
     category_id: Mapped[int] = mapped_column(ForeignKey('category.id'), nullable=False)
+    # প্রতিটি UPDATE এ SQLAlchemy নিজে বাড়ায়; টেমপ্লেট ফ্র্যাগমেন্ট ক্যাশের key তে ব্যবহৃত হয়
+    version_id: Mapped[int] = mapped_column(Integer, nullable=False, server_default='1')
 
     author: Mapped["User"] = relationship(back_populates="posts")
     category: Mapped["Category"] = relationship(back_populates="posts")
-    comments: Mapped[list["Comment"]] = relationship(back_populates="post", cascade="all, delete-orphan")
-    votes: Mapped[list["Vote"]] = relationship(back_populates="post", cascade="all, delete-orphan")
+    # ON DELETE CASCADE ডাটাবেস নিজেই কমেন্ট ও ভোট মুছে ফেলে, তাই ORM এগুলো লোড করে না
+    comments: Mapped[list["Comment"]] = relationship(back_populates="post", cascade="all, delete-orphan", passive_deletes=True)
+    votes: Mapped[list["Vote"]] = relationship(back_populates="post", cascade="all, delete-orphan", passive_deletes=True)
+
+    __mapper_args__ = {'version_id_col': version_id}
+
+    # ফিড, প্রোফাইল এবং ক্যাটাগরি পেজ সবই created_at অনুযায়ী সাজানো হয়
+    __table_args__ = (
+        db.Index('ix_post_created_at', 'created_at'),
+        db.Index('ix_post_category_id_created_at', 'category_id', 'created_at'),
+        db.Index('ix_post_author_id_created_at', 'author_id', 'created_at'),
+    )
+
+    @validates('content')
+    def _update_excerpt(self, key, content):
+        self.excerpt = make_excerpt(content)
+        return content
 
     @property
     def likes(self):
@@ -211,16 +286,54 @@ class Comment(db.Model):
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     content: Mapped[str] = mapped_column(Text, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
-    author_id: Mapped[int] = mapped_column(ForeignKey('user.id'), nullable=False)
-    post_id: Mapped[int] = mapped_column(ForeignKey('post.id'), nullable=False)
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc), index=True)
+    # ইউজার মুছলে cascade এবং purge_users দুটোই author_id দিয়ে কমেন্ট খোঁজে
+    author_id: Mapped[int] = mapped_column(ForeignKey('user.id', ondelete='CASCADE'), index=True, nullable=False)
+    post_id: Mapped[int] = mapped_column(ForeignKey('post.id', ondelete='CASCADE'), nullable=False)
+    # Post.version_id এর মতো, অ্যাডমিন এডিট করলে কমেন্টের ক্যাশ করা HTML বাতিল হয়
+    version_id: Mapped[int] = mapped_column(Integer, nullable=False, server_default='1')
 
     author: Mapped["User"] = relationship(back_populates="comments")
     post: Mapped["Post"] = relationship(back_populates="comments")
 
-    parent_id: Mapped[Optional[int]] = mapped_column(ForeignKey('comment.id'))
-    replies: Mapped[list["Comment"]] = relationship("Comment", back_populates="parent", cascade="all, delete-orphan")
+    parent_id: Mapped[Optional[int]] = mapped_column(ForeignKey('comment.id', ondelete='CASCADE'), index=True)
+    replies: Mapped[list["Comment"]] = relationship("Comment", back_populates="parent", cascade="all, delete-orphan", passive_deletes=True)
     parent: Mapped[Optional["Comment"]] = relationship("Comment", back_populates="replies", remote_side=[id])
 
+    __mapper_args__ = {'version_id_col': version_id}
+
+    # post_detail পুরো থ্রেড post_id দিয়ে পড়ে; টপ-লেভেল কমেন্ট গোনা/খোঁজা হয় post_id, parent_id দিয়ে
+    __table_args__ = (
+        db.Index('ix_comment_post_id_parent_id_created_at', 'post_id', 'parent_id', 'created_at'),
+    )
+
+    @staticmethod
+    def load_thread(post_id):
+        """All comments of a post as a tree: top-level comments, oldest first.
+
+        The whole thread is read with one query plus one for the authors, and
+        ``replies``, ``parent`` and ``author`` are filled in from it, so
+        rendering never lazy-loads, however deep the replies go.
+        """
+        comments = db.session.scalars(
+            db.select(Comment).where(Comment.post_id == post_id).options(selectinload(Comment.author))
+        ).all()
+        # ORDER BY ইনডেক্সের সাথে মেলে না, তাই Python এ সাজানো হয় (থ্রেড একবারেই পুরোটা লোড হয়)
+        comments.sort(key=lambda comment: (comment.created_at, comment.id))
+        by_id = {comment.id: comment for comment in comments}
+        replies = {comment.id: [] for comment in comments}
+        roots = []
+        for comment in comments:
+            parent = by_id.get(comment.parent_id)
+            set_committed_value(comment, 'parent', parent)
+            if parent is None:
+                roots.append(comment)
+            else:
+                replies[parent.id].append(comment)
+        for comment in comments:
+            set_committed_value(comment, 'replies', replies[comment.id])
+        return roots
+
 
 # ------------------------------
 # Notification Model
@@ -228,14 +341,89 @@ class Comment(db.Model):
 class Notification(db.Model):
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String(128), nullable=False)
-    user_id: Mapped[int] = mapped_column(ForeignKey('user.id'), nullable=False)
+    user_id: Mapped[int] = mapped_column(ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
     timestamp: Mapped[float] = mapped_column(db.Float, index=True, default=time.time)
     payload_json: Mapped[str] = mapped_column(Text)
 
     user: Mapped["User"] = relationship(back_populates="notifications")
 
+    __table_args__ = (
+        db.Index('ix_notification_user_id_timestamp', 'user_id', 'timestamp'),
+    )
+
     def get_payload(self):
         return json.loads(self.payload_json)
 
     def __repr__(self):
         return f'<Notification {self.name}>'
+
+
+# ------------------------------
+# Background Job State
+# ------------------------------
+class JobState(db.Model):
+    """প্রতিটি রক্ষণাবেক্ষণ জবের শেষ রানের অবস্থা; lease_until দিয়ে একসাথে একটি worker ই জব চালায়।"""
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    last_started_at: Mapped[Optional[float]] = mapped_column(db.Float)
+    last_finished_at: Mapped[Optional[float]] = mapped_column(db.Float)
+    last_status: Mapped[Optional[str]] = mapped_column(String(16))
+    last_duration: Mapped[Optional[float]] = mapped_column(db.Float)
+    last_result_json: Mapped[Optional[str]] = mapped_column(Text)
+    run_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    lease_until: Mapped[Optional[float]] = mapped_column(db.Float)
+
+    def get_result(self):
+        return json.loads(self.last_result_json) if self.last_result_json else None
+
+    def __repr__(self):
+        return f'<JobState {self.name} {self.last_status}>'
+
+
+# ------------------------------
+# Derived Site Statistics
+# ------------------------------
+class SiteStat(db.Model):
+    """ব্যাকগ্রাউন্ড জবে হিসাব করা পরিসংখ্যান, যাতে রিকোয়েস্টের সময় আবার গণনা করতে না হয়।"""
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    value_json: Mapped[str] = mapped_column(Text, nullable=False)
+    updated_at: Mapped[float] = mapped_column(db.Float, default=time.time, nullable=False)
+
+    @staticmethod
+    def get_value(key, max_age=None):
+        """সংরক্ষিত মান; max_age সেকেন্ডের চেয়ে পুরোনো হলে None।"""
+        stat = db.session.get(SiteStat, key)
+        if stat is None or (max_age is not None and stat.updated_at < time.time() - max_age):
+            return None
+        return json.loads(stat.value_json)
+
+    @staticmethod
+    def set_value(key, value):
+        stat = db.session.get(SiteStat, key) or SiteStat(key=key)
+        stat.value_json = json.dumps(value)
+        stat.updated_at = time.time()
+        db.session.add(stat)
+        return stat
+
+
+# ------------------------------
+# Deleted Rows (export tombstones)
+# ------------------------------
+class DeletedRow(db.Model):
+    """মুছে ফেলা সারির id, যাতে delta এক্সপোর্ট মুছে ফেলাও জানাতে পারে; SQLite trigger সারি যোগ করে।"""
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    table_name: Mapped[str] = mapped_column(String(32), nullable=False)
+    row_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    deleted_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+
+
+# ON DELETE CASCADE এ মোছা সারিও trigger ধরে, যা অ্যাপের কোড দেখতে পায় না।
+# batch মাইগ্রেশনে এই টেবিলগুলো rebuild করলে trigger মুছে যায়, তখন আবার তৈরি করতে হয়।
+# SQLite সময় স্ট্রিং হিসেবে তুলনা করে, তাই SQLAlchemy এর মতো ছয় অঙ্কের ভগ্নাংশ লেখা হয় ('%f' তিন অঙ্ক দেয়)।
+TRACKED_DELETES = ('user', 'post', 'comment', 'vote')
+
+for _table_name in TRACKED_DELETES:
+    event.listen(db.metadata, 'after_create', DDL(
+        f'CREATE TRIGGER IF NOT EXISTS trg_{_table_name}_deleted AFTER DELETE ON "{_table_name}" BEGIN '
+        f"INSERT INTO deleted_row (table_name, row_id, deleted_at) "
+        f"VALUES ('{_table_name}', OLD.id, strftime('%%Y-%%m-%%d %%H:%%M:%%f', 'now') || '000'); END"
+    ).execute_if(dialect='sqlite'))
@@ -0,0 +1,138 @@
+# app/moderation.py
+"""Set-based moderation helpers.
+
+These run a handful of bulk DELETE statements instead of loading every row
+into the session and letting the ORM cascade delete them one by one.
+
+Comments are always deleted flat: ``parent_id`` is cleared before the
+DELETE, so the database never cascades from a reply to its replies. SQLite
+counts each level of such a cascade against its trigger depth limit (1000),
+and a long enough reply chain would make the whole delete fail.
+"""
+import os
+
+from flask import current_app
+from sqlalchemy import delete, or_, select, update
+
+from app import db, user_cache
+from app.models import Comment, Notification, Post, User, Vote
+from app.suggest import suggest_index
+
+# SQLite এর bound parameter সীমার অনেক নিচে
+ID_CHUNK_SIZE = 500
+
+
+def _bulk_delete(stmt):
+    result = db.session.execute(stmt, execution_options={'synchronize_session': False})
+    return result.rowcount
+
+
+def _unreferenced_post_images(filenames):
+    """Filter out images that another post still uses (dedupe-post-images shares files)."""
+    filenames = set(filter(None, filenames))
+    if not filenames:
+        return []
+    still_used = set(db.session.scalars(select(Post.image).where(Post.image.in_(filenames))))
+    return sorted(filenames - still_used)
+
+
+def _remove_uploads(folder, filenames):
+    """Delete uploaded files from ``static/uploads/<folder>``, ignoring missing ones."""
+    upload_dir = os.path.join(current_app.root_path, 'static/uploads', folder)
+    for filename in filenames:
+        if not filename or filename == 'default.jpg':
+            continue
+        try:
+            os.remove(os.path.join(upload_dir, filename))
+        except FileNotFoundError:
+            pass
+
+
+def comment_tree_ids(root_condition):
+    """Recursive CTE selecting every comment matching ``root_condition`` and all replies below it."""
+    tree = select(Comment.id).where(root_condition).cte('comment_tree', recursive=True)
+    tree = tree.union(select(Comment.id).where(Comment.parent_id == tree.c.id))
+    return select(tree.c.id)
+
+
+def _delete_comment_ids(comment_ids):
+    """Delete the given comments without letting their parent_id foreign key cascade."""
+    chunks = [comment_ids[i:i + ID_CHUNK_SIZE] for i in range(0, len(comment_ids), ID_CHUNK_SIZE)]
+    for chunk in chunks:
+        _bulk_delete(update(Comment).where(Comment.id.in_(chunk)).values(parent_id=None))
+    return sum(_bulk_delete(delete(Comment).where(Comment.id.in_(chunk))) for chunk in chunks)
+
+
+def delete_comments(comment_ids):
+    """Delete comments together with every reply below them. Returns the number of deleted comments."""
+    comment_ids = list(comment_ids)
+    if not comment_ids:
+        return 0
+    count = _delete_comment_ids(db.session.scalars(comment_tree_ids(Comment.id.in_(comment_ids))).all())
+    db.session.commit()
+    return count
+
+
+def delete_posts(post_ids):
+    """Delete posts with a single statement and remove their uploaded images.
+
+    Comments, nested replies and votes are removed by the database through
+    their ON DELETE CASCADE foreign keys, so none of them are loaded into the
+    session. Returns the number of deleted posts.
+    """
+    post_ids = list(post_ids)
+    if not post_ids:
+        return 0
+
+    images = db.session.scalars(
+        select(Post.image).where(Post.id.in_(post_ids), Post.image.is_not(None))
+    ).all()
+    # উত্তরগুলো আলাদা করে দিলে post এর cascade প্রতিটি কমেন্ট এক স্তরেই মুছে ফেলে
+    _bulk_delete(update(Comment).where(Comment.post_id.in_(post_ids)).values(parent_id=None))
+    count = _bulk_delete(delete(Post).where(Post.id.in_(post_ids)))
+    db.session.commit()
+    suggest_index.remove('post', post_ids)
+
+    _remove_uploads('posts', _unreferenced_post_images(images))
+    return count
+
+
+def purge_users(user_ids):
+    """Delete users together with their posts, comments, votes and notifications.
+
+    Replies written by other users under a purged comment or post are removed
+    as well, so no thread is left pointing at a missing parent.
+    Returns a dict with the number of deleted rows per table.
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return {}
+
+    post_ids = select(Post.id).where(Post.author_id.in_(user_ids))
+    posts = db.session.execute(select(Post.id, Post.image).where(Post.author_id.in_(user_ids))).all()
+    profile_pictures = db.session.scalars(
+        select(User.profile_picture).where(User.id.in_(user_ids))
+    ).all()
+
+    doomed_comments = comment_tree_ids(
+        or_(Comment.author_id.in_(user_ids), Comment.post_id.in_(post_ids))
+    )
+
+    counts = {
+        'votes': _bulk_delete(
+            delete(Vote).where(or_(Vote.user_id.in_(user_ids), Vote.post_id.in_(post_ids)))
+        ),
+        'comments': _delete_comment_ids(db.session.scalars(doomed_comments).all()),
+        'notifications': _bulk_delete(delete(Notification).where(Notification.user_id.in_(user_ids))),
+        'posts': _bulk_delete(delete(Post).where(Post.author_id.in_(user_ids))),
+        'users': _bulk_delete(delete(User).where(User.id.in_(user_ids))),
+    }
+    db.session.commit()
+    for user_id in user_ids:
+        user_cache.invalidate(user_id)
+    suggest_index.remove('user', user_ids)
+    suggest_index.remove('post', [post_id for post_id, _ in posts])
+
+    _remove_uploads('posts', _unreferenced_post_images(image for _, image in posts))
+    _remove_uploads('profiles', profile_pictures)
+    return counts
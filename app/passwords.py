@@ -0,0 +1,56 @@
+# app/passwords.py
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class PasswordHasher:
+    """Password hashing with a configurable scheme and cost.
+
+    ``PASSWORD_HASH_METHOD`` is any Werkzeug method string, e.g.
+    ``'scrypt:32768:8:1'`` or ``'pbkdf2:sha256:600000'``. Hashes made with
+    other parameters keep working; ``needs_rehash`` tells the login view to
+    replace them once the plain password is known.
+
+    With ``PASSWORD_HASH_THREADS`` > 0, hashing runs in a thread pool of that
+    size. Werkzeug's scrypt and pbkdf2 release the GIL, so the pool both lets
+    a threaded worker hash in parallel and caps how many hashes (and, for
+    scrypt, how many 32 MB work buffers) are in flight at once.
+    """
+
+    def __init__(self, app=None):
+        self.method = None
+        self._method_prefix = None
+        self._threads = 0
+        self._executor = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.method = app.config['PASSWORD_HASH_METHOD']
+        self._threads = app.config['PASSWORD_HASH_THREADS']
+        # 'scrypt' এর মতো সংক্ষিপ্ত নাম হলে Werkzeug ডিফল্ট প্যারামিটার বসায়, তাই আসল prefix টা একবার হ্যাশ করে বের করা হয়
+        self._method_prefix = generate_password_hash('', self.method).split('$', 1)[0]
+
+    def _run(self, func, *args):
+        if not self._threads:
+            return func(*args)
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(self._threads, thread_name_prefix='password-hash')
+        return self._executor.submit(func, *args).result()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, pwhash, password):
+        if not pwhash:
+            return False
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        return bool(pwhash) and pwhash.split('$', 1)[0] != self._method_prefix
@@ -0,0 +1,161 @@
+# app/profiler.py
+
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from flask import g, request
+from flask_login import current_user
+
+
+def _frame_label(code, roots):
+    filename = code.co_filename
+    for root in roots:
+        if filename.startswith(root):
+            filename = os.path.relpath(filename, root)
+            break
+    # collapsed ফরম্যাটে ';' ফ্রেম আলাদা করে, তাই নামের ভেতরে থাকতে পারবে না
+    return f'{code.co_name} ({filename}:{code.co_firstlineno})'.replace(';', ':')
+
+
+class _StackSampler(threading.Thread):
+    """Samples one thread's Python stack every ``interval`` seconds into collapsed-stack counts."""
+
+    def __init__(self, thread_id, interval, roots):
+        super().__init__(name='request-profiler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.roots = roots
+        self.counts = Counter()
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code, self.roots))
+                frame = frame.f_back
+            if stack:
+                self.counts[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+    def collapsed(self):
+        return ''.join(f'{stack} {count}\n' for stack, count in self.counts.most_common())
+
+
+class RequestProfiler:
+    """Profiles single requests on demand for admins.
+
+    A request is profiled when it carries ``?<PROFILER_QUERY_ARG>=1`` or the
+    ``PROFILER_HEADER`` header and the logged-in user is an admin. The view
+    runs under cProfile while a sampler thread records the full stack every
+    ``PROFILER_SAMPLE_INTERVAL`` seconds; both are saved to
+    ``instance/profiles`` as a ``.prof`` (pstats) and a ``.collapsed``
+    (flamegraph.pl / speedscope) file and listed in the admin panel.
+
+    Requests without the flag only pay for one query-string and one header
+    lookup; the user is not even loaded. With ``PROFILER_ENABLED = False``
+    no hooks are registered at all.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.directory = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        self.directory = os.path.join(app.instance_path, 'profiles')
+        if not app.config['PROFILER_ENABLED']:
+            return
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.teardown_request(self._abort)
+
+    def _requested(self):
+        config = self.app.config
+        if not (request.args.get(config['PROFILER_QUERY_ARG']) or request.headers.get(config['PROFILER_HEADER'])):
+            return False
+        return current_user.is_authenticated and current_user.is_admin
+
+    def _start(self):
+        if not self._requested():
+            return
+        roots = sorted({os.path.dirname(self.app.root_path), sys.prefix, *sys.path[1:]}, key=len, reverse=True)
+        sampler = _StackSampler(threading.get_ident(), self.app.config['PROFILER_SAMPLE_INTERVAL'], roots)
+        profile = cProfile.Profile()
+        g.request_profile = (profile, sampler, time.perf_counter())
+        sampler.start()
+        profile.enable()
+
+    def _stop(self):
+        profile, sampler, started = g.pop('request_profile')
+        profile.disable()
+        sampler.stop()
+        return profile, sampler, time.perf_counter() - started
+
+    def _finish(self, response):
+        if 'request_profile' not in g:
+            return response
+        profile, sampler, duration = self._stop()
+        profile_id = self.save(profile, sampler, duration, response.status_code)
+        response.headers['X-Profile-Id'] = profile_id
+        return response
+
+    def _abort(self, exc):
+        # after_request চলেনি (যেমন exception), তাই শুধু প্রোফাইলার বন্ধ করা হয়
+        if 'request_profile' in g:
+            self._stop()
+
+    def save(self, profile, sampler, duration, status_code):
+        os.makedirs(self.directory, exist_ok=True)
+        profile_id = f'{time.strftime("%Y%m%d-%H%M%S")}-{uuid.uuid4().hex[:8]}'
+        base = os.path.join(self.directory, profile_id)
+        profile.dump_stats(base + '.prof')
+        with open(base + '.collapsed', 'w') as f:
+            f.write(sampler.collapsed())
+        with open(base + '.json', 'w') as f:
+            json.dump({
+                'id': profile_id,
+                'method': request.method,
+                'path': request.full_path.rstrip('?'),
+                'endpoint': request.endpoint,
+                'status': status_code,
+                'duration_ms': round(duration * 1000, 1),
+                'samples': sum(sampler.counts.values()),
+                'user': current_user.username,
+                'created_at': time.time(),
+            }, f)
+        self._prune()
+        return profile_id
+
+    def profiles(self):
+        """Saved profiles' metadata, newest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                with open(os.path.join(self.directory, name)) as f:
+                    entries.append(json.load(f))
+        # id তে সময় সেকেন্ড পর্যন্ত, একই সেকেন্ডের প্রোফাইলের ক্রম ঠিক রাখতে created_at দিয়ে সাজানো হয়
+        entries.sort(key=lambda meta: meta['created_at'], reverse=True)
+        return entries
+
+    def _prune(self):
+        for meta in self.profiles()[self.app.config['PROFILER_KEEP']:]:
+            for suffix in ('.json', '.prof', '.collapsed'):
+                try:
+                    os.remove(os.path.join(self.directory, meta['id'] + suffix))
+                except FileNotFoundError:
+                    pass
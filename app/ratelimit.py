@@ -0,0 +1,183 @@
+# app/ratelimit.py
+"""Token-bucket rate limiting for the write endpoints.
+
+Every policy in ``RATELIMIT_POLICIES`` maps an endpoint to ``"N/period"``:
+a client may send N requests in a burst and earns one new request every
+``period / N`` seconds. Clients are keyed by user id when logged in and by
+IP address otherwise. Only state-changing requests (POST etc.) are counted,
+so reading a post or opening the login page is never throttled.
+
+``RATELIMIT_STORAGE = 'memory'`` keeps the buckets in the worker process;
+``'sqlite'`` keeps them in a small local SQLite file that all gunicorn
+workers on the machine share. It is a separate file from the forum
+database, so throttling never competes with the forum's own writes.
+"""
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from flask import jsonify, render_template, request
+from flask_login import current_user
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+EXEMPT_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+@dataclass(frozen=True)
+class Policy:
+    capacity: int
+    rate: float  # প্রতি সেকেন্ডে কতগুলো টোকেন ফেরত আসে
+
+    @classmethod
+    def parse(cls, spec):
+        count, _, period = spec.partition('/')
+        period = period.strip().rstrip('s')
+        if period not in PERIODS:
+            raise ValueError(f'Unknown rate limit period in {spec!r}')
+        count = int(count)
+        return cls(capacity=count, rate=count / PERIODS[period])
+
+
+def _take(tokens, updated, now, policy):
+    """Refill a bucket and try to take one token; returns (tokens, retry_after)."""
+    tokens = min(policy.capacity, tokens + (now - updated) * policy.rate)
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    return tokens, (1 - tokens) / policy.rate
+
+
+class MemoryBackend:
+    """Buckets in a bounded LRU dict; each worker process counts on its own."""
+
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key, policy):
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (policy.capacity, now))
+            tokens, retry_after = _take(tokens, updated, now, policy)
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            # সবচেয়ে পুরোনো বাকেট বাদ দিলে সেই ক্লায়েন্ট শুধু পূর্ণ বাকেট ফেরত পায়
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        return retry_after
+
+
+class SQLiteBackend:
+    """Buckets in a local SQLite file shared by every worker on the machine."""
+
+    CLEANUP_EVERY = 1000
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._hits = 0
+        # কানেকশন থ্রেড-প্রতি খোলা হয়; এখানকারটা বন্ধ করা হয় যাতে fork হওয়া worker এ না যায়
+        conn = sqlite3.connect(path, isolation_level=None)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS bucket ('
+                'key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, full_at REAL NOT NULL)'
+            )
+        finally:
+            conn.close()
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=0.1, isolation_level=None)
+            # কাউন্টার হারালে ক্ষতি নেই, তাই fsync এর দরকার নেই
+            conn.execute('PRAGMA synchronous=OFF')
+            self._local.conn = conn
+        return conn
+
+    def hit(self, key, policy):
+        now = time.time()
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT tokens, updated FROM bucket WHERE key = ?', (key,)).fetchone()
+            tokens, updated = row if row else (policy.capacity, now)
+            tokens, retry_after = _take(tokens, updated, now, policy)
+            full_at = now + (policy.capacity - tokens) / policy.rate
+            conn.execute(
+                'INSERT OR REPLACE INTO bucket (key, tokens, updated, full_at) VALUES (?, ?, ?, ?)',
+                (key, tokens, now, full_at),
+            )
+            self._hits += 1
+            if self._hits % self.CLEANUP_EVERY == 0:
+                # পূর্ণ হয়ে যাওয়া বাকেট রাখার দরকার নেই, না থাকলেও একই ফল দেয়
+                conn.execute('DELETE FROM bucket WHERE full_at <= ?', (now,))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return retry_after
+
+
+class RateLimiter:
+    """Checks ``RATELIMIT_POLICIES`` in ``before_request`` and answers 429 with Retry-After.
+
+    AJAX requests (``X-Requested-With: XMLHttpRequest``) get a JSON error like
+    the login handler does; form posts get the ``429.html`` page.
+    """
+
+    def __init__(self, app=None):
+        self.app = None
+        self.backend = None
+        self.policies = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        if not app.config['RATELIMIT_ENABLED']:
+            return
+        self.policies = {
+            endpoint: Policy.parse(spec) for endpoint, spec in app.config['RATELIMIT_POLICIES'].items()
+        }
+        if app.config['RATELIMIT_STORAGE'] == 'sqlite':
+            path = app.config['RATELIMIT_STORAGE_PATH'] or os.path.join(app.instance_path, 'ratelimit.db')
+            self.backend = SQLiteBackend(path)
+        else:
+            self.backend = MemoryBackend(app.config['RATELIMIT_MEMORY_SIZE'])
+        app.before_request(self._check)
+
+    @staticmethod
+    def client_key():
+        if current_user.is_authenticated:
+            return f'user:{current_user.id}'
+        return f'ip:{request.remote_addr}'
+
+    def _check(self):
+        if request.method in EXEMPT_METHODS:
+            return None
+        policy = self.policies.get(request.endpoint)
+        if policy is None:
+            return None
+        try:
+            retry_after = self.backend.hit(f'{request.endpoint}:{self.client_key()}', policy)
+        except sqlite3.Error:
+            # লিমিটার কাজ না করলে বৈধ রিকোয়েস্ট আটকানোর চেয়ে ছেড়ে দেওয়া ভালো
+            self.app.logger.warning('Rate limiter storage unavailable', exc_info=True)
+            return None
+        if retry_after <= 0:
+            return None
+        return self._too_many_requests(math.ceil(retry_after))
+
+    @staticmethod
+    def _too_many_requests(retry_after):
+        if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
+            response = jsonify(status='error', message='rate_limited', retry_after=retry_after)
+        else:
+            response = render_template('429.html', retry_after=retry_after)
+        return response, 429, {'Retry-After': str(retry_after)}
@@ -0,0 +1,79 @@
+// app/static/js/suggest.js
+// নেভবারের সার্চ বক্সে টাইপ করার সময় /search/suggest থেকে পোস্ট, ইউজার ও ক্যাটাগরির সাজেশন দেখায়।
+// প্রিফিক্স ছোট হাতের করে পাঠানো হয়, যাতে একই প্রিফিক্সের রেসপন্স ব্রাউজার ক্যাশ থেকে আসে।
+(function() {
+    const suggestUrl = document.currentScript.dataset.suggestUrl;
+    const sections = [
+        ['posts', 'Posts', item => item.title],
+        ['users', 'Users', item => item.username],
+        ['categories', 'Categories', item => item.name],
+    ];
+
+    document.addEventListener('DOMContentLoaded', function() {
+        const input = document.getElementById('navbar-search');
+        const menu = document.getElementById('navbar-search-suggestions');
+        if (!input || !menu) {
+            return;
+        }
+        let timer = null;
+        let latest = '';
+
+        function hide() {
+            menu.classList.remove('show');
+            menu.replaceChildren();
+        }
+
+        function render(data) {
+            menu.replaceChildren();
+            for (const [key, heading, label] of sections) {
+                if (!data[key].length) {
+                    continue;
+                }
+                const header = document.createElement('h6');
+                header.className = 'dropdown-header';
+                header.textContent = heading;
+                menu.appendChild(header);
+                for (const item of data[key]) {
+                    const link = document.createElement('a');
+                    link.className = 'dropdown-item text-truncate';
+                    link.href = item.url;
+                    link.textContent = label(item);
+                    menu.appendChild(link);
+                }
+            }
+            menu.classList.toggle('show', menu.children.length > 0);
+        }
+
+        input.addEventListener('input', function() {
+            clearTimeout(timer);
+            const prefix = input.value.trim().toLowerCase();
+            latest = prefix;
+            if (!prefix) {
+                hide();
+                return;
+            }
+            timer = setTimeout(function() {
+                fetch(`${suggestUrl}?q=${encodeURIComponent(prefix)}`)
+                    .then(response => response.json())
+                    .then(data => {
+                        // পুরোনো প্রিফিক্সের দেরিতে আসা উত্তর বাদ
+                        if (prefix === latest) {
+                            render(data);
+                        }
+                    })
+                    .catch(error => console.error('Error:', error));
+            }, 150);
+        });
+
+        input.addEventListener('keydown', function(e) {
+            if (e.key === 'Escape') {
+                hide();
+            }
+        });
+        document.addEventListener('click', function(e) {
+            if (!menu.contains(e.target) && e.target !== input) {
+                hide();
+            }
+        });
+    });
+})();
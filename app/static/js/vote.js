@@ -0,0 +1,41 @@
+// app/static/js/vote.js
+// সব পেজের লাইক/ডিসলাইক বাটনের জন্য শেয়ার করা AJAX স্ক্রিপ্ট।
+// CSRF টোকেন, লগইন অবস্থা এবং লগইন পেজের URL <script> ট্যাগের data-* অ্যাট্রিবিউট থেকে আসে।
+(function() {
+    const config = document.currentScript.dataset;
+
+    document.addEventListener('DOMContentLoaded', function() {
+        document.body.addEventListener('click', function(e) {
+            const voteButton = e.target.closest('.vote-btn');
+            if (!voteButton) {
+                return;
+            }
+            e.preventDefault();
+
+            if (config.authenticated !== 'true') {
+                window.location.href = config.loginUrl;
+                return;
+            }
+
+            const postId = voteButton.dataset.postId;
+            const voteType = voteButton.dataset.voteType;
+
+            fetch(`/vote/${postId}/${voteType}`, {
+                method: 'POST',
+                headers: { 'X-CSRF-Token': config.csrfToken, 'X-Requested-With': 'XMLHttpRequest' }
+            })
+            .then(response => response.json())
+            .then(data => {
+                if (data.status === 'success') {
+                    document.getElementById(`likes-count-${postId}`).textContent = data.likes;
+                    document.getElementById(`dislikes-count-${postId}`).textContent = data.dislikes;
+                } else if (data.message === 'login_required') {
+                    window.location.href = config.loginUrl;
+                } else if (data.message === 'rate_limited') {
+                    alert(`Too many votes. Please wait ${data.retry_after} seconds.`);
+                }
+            })
+            .catch(error => console.error('Error:', error));
+        });
+    });
+})();
@@ -0,0 +1,208 @@
+# app/suggest.py
+"""In-memory prefix index behind the navbar search suggestions.
+
+Every suggestible thing (post title, username, category name) is stored as
+one or more ``(key, kind, id)`` tuples in a single sorted list, so a prefix
+lookup is a ``bisect`` followed by a short forward scan. Post titles are
+indexed from each of their first ``SUGGEST_TITLE_WORDS`` words, so "cat"
+also finds "My black cat".
+
+Each worker starts building its own index in the background on its first
+request (CLI commands never build it) and keeps it current from the commits
+it makes itself (session events plus the bulk
+deletes in ``app.moderation``). Changes made by other workers show up after
+the next periodic rebuild, ``SUGGEST_REFRESH_INTERVAL`` seconds later.
+Memory is bounded by indexing only the newest ``SUGGEST_MAX_POSTS`` posts
+and ``SUGGEST_MAX_USERS`` users.
+"""
+import bisect
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import db
+from app.models import Category, Post, User
+
+KEY_LENGTH = 64
+# প্রিফিক্সের সাথে মেলা এর বেশি এন্ট্রি দেখা হয় না, তাই খুব ছোট প্রিফিক্সেও লুকআপ দ্রুত থাকে
+SCAN_LIMIT = 200
+KINDS = {Post: 'post', User: 'user', Category: 'category'}
+LABEL_ATTRS = {'post': 'title', 'user': 'username', 'category': 'name'}
+
+
+def normalize(text):
+    return ' '.join(unicodedata.normalize('NFKC', text or '').casefold().split())[:KEY_LENGTH]
+
+
+class SuggestIndex:
+    def __init__(self):
+        self.app = None
+        self._entries = []
+        self._items = {kind: OrderedDict() for kind in LABEL_ATTRS}
+        self._built_at = None
+        self._refreshing = False
+        self._warmed_up = False
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        event.listen(db.session, 'after_flush', _collect_changes)
+        event.listen(db.session, 'after_commit', self._apply_changes)
+        event.listen(db.session, 'after_soft_rollback', _discard_changes)
+        if not app.testing:
+            app.before_request(self._warm_up)
+
+    # ------------------------------
+    # Building
+    # ------------------------------
+    def _keys(self, kind, label):
+        if kind != 'post':
+            return [normalize(label)]
+        words = normalize(label).split(' ')
+        limit = self.app.config['SUGGEST_TITLE_WORDS']
+        return list(dict.fromkeys(' '.join(words[i:])[:KEY_LENGTH] for i in range(min(len(words), limit))))
+
+    def rebuild(self):
+        """Reload the index from the database and swap it in."""
+        config = self.app.config
+        rows = {
+            'post': db.session.execute(
+                select(Post.id, Post.title).order_by(Post.id.desc()).limit(config['SUGGEST_MAX_POSTS'])
+            ).all(),
+            'user': db.session.execute(
+                select(User.id, User.username).order_by(User.id.desc()).limit(config['SUGGEST_MAX_USERS'])
+            ).all(),
+            'category': db.session.execute(select(Category.id, Category.name)).all(),
+        }
+        items = {kind: OrderedDict() for kind in LABEL_ATTRS}
+        entries = []
+        for kind, kind_rows in rows.items():
+            # পুরোনোটি আগে থাকে, যাতে সীমা ছাড়ালে popitem(last=False) সবচেয়ে পুরোনোটি বাদ দেয়
+            for item_id, label in sorted(kind_rows):
+                keys = self._keys(kind, label)
+                items[kind][item_id] = (label, keys)
+                entries.extend((key, kind, item_id) for key in keys if key)
+        entries.sort()
+        with self._lock:
+            self._entries, self._items = entries, items
+            self._built_at = time.monotonic()
+
+    def _refresh_in_background(self):
+        with self.app.app_context():
+            try:
+                self.rebuild()
+            except SQLAlchemyError:
+                # টেবিল এখনো তৈরি না হলে (যেমন `flask db upgrade` এর সময়) প্রথম লুকআপে আবার চেষ্টা হবে
+                self.app.logger.info('Search suggestion index not built yet', exc_info=True)
+            finally:
+                db.session.remove()
+                self._refreshing = False
+
+    def _start_refresh(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh_in_background, name='suggest-index', daemon=True).start()
+
+    def _warm_up(self):
+        # প্রথম লুকআপের আগেই ইনডেক্স তৈরি শুরু হয়; এটি শুধু একবার চলে
+        if not self._warmed_up:
+            self._warmed_up = True
+            self._start_refresh()
+
+    def _ensure_fresh(self):
+        """Build the index on first use and schedule periodic rebuilds; False if it is not available."""
+        if self._built_at is None:
+            try:
+                self.rebuild()
+            except SQLAlchemyError:
+                db.session.rollback()
+                self.app.logger.warning('Search suggestion index could not be built', exc_info=True)
+                return False
+        elif time.monotonic() - self._built_at > self.app.config['SUGGEST_REFRESH_INTERVAL']:
+            self._start_refresh()
+        return True
+
+    # ------------------------------
+    # Incremental updates
+    # ------------------------------
+    def _remove_locked(self, kind, item_id):
+        item = self._items[kind].pop(item_id, None)
+        if item is None:
+            return
+        for key in item[1]:
+            i = bisect.bisect_left(self._entries, (key, kind, item_id))
+            if i < len(self._entries) and self._entries[i] == (key, kind, item_id):
+                del self._entries[i]
+
+    def put(self, kind, item_id, label):
+        keys = self._keys(kind, label)
+        limit = {'post': self.app.config['SUGGEST_MAX_POSTS'], 'user': self.app.config['SUGGEST_MAX_USERS']}.get(kind)
+        with self._lock:
+            self._remove_locked(kind, item_id)
+            self._items[kind][item_id] = (label, keys)
+            for key in keys:
+                if key:
+                    bisect.insort(self._entries, (key, kind, item_id))
+            while limit is not None and len(self._items[kind]) > limit:
+                self._remove_locked(kind, next(iter(self._items[kind])))
+
+    def remove(self, kind, item_ids):
+        with self._lock:
+            for item_id in item_ids:
+                self._remove_locked(kind, item_id)
+
+    def _apply_changes(self, session):
+        for change in session.info.pop('suggest_changes', ()):
+            if change[0] == 'put':
+                self.put(*change[1:])
+            else:
+                self.remove(change[1], [change[2]])
+
+    # ------------------------------
+    # Lookup
+    # ------------------------------
+    def lookup(self, prefix, limit):
+        """Return up to ``limit`` ``(id, label)`` matches per kind for ``prefix``."""
+        prefix = normalize(prefix)
+        results = {kind: {} for kind in LABEL_ATTRS}
+        if not prefix or not self._ensure_fresh():
+            return {kind: [] for kind in LABEL_ATTRS}
+        with self._lock:
+            i = bisect.bisect_left(self._entries, (prefix,))
+            for key, kind, item_id in self._entries[i:i + SCAN_LIMIT]:
+                if not key.startswith(prefix):
+                    break
+                results[kind][item_id] = self._items[kind][item_id][0]
+        # নতুন পোস্ট/ইউজার আগে; ক্যাটাগরি নাম অনুযায়ী
+        return {
+            kind: sorted(matches.items(), key=(lambda m: m[1]) if kind == 'category' else (lambda m: -m[0]))[:limit]
+            for kind, matches in results.items()
+        }
+
+
+def _collect_changes(session, flush_context):
+    changes = session.info.setdefault('suggest_changes', [])
+    for obj in session.deleted:
+        kind = KINDS.get(type(obj))
+        if kind:
+            changes.append(('remove', kind, obj.id))
+    for obj in list(session.new) + list(session.dirty):
+        kind = KINDS.get(type(obj))
+        if kind is None or obj in session.deleted:
+            continue
+        attr = LABEL_ATTRS[kind]
+        if obj in session.new or inspect(obj).attrs[attr].history.has_changes():
+            changes.append(('put', kind, obj.id, getattr(obj, attr)))
+
+
+def _discard_changes(session, previous_transaction):
+    session.info.pop('suggest_changes', None)
+
+
+suggest_index = SuggestIndex()
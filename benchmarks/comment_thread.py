@@ -0,0 +1,109 @@
+"""Render time of a large comment thread with and without the fragment cache.
+
+Seeds a throwaway in-memory database with one post carrying COMMENTS
+comments (about half of them replies) by AUTHORS authors who all have a
+profile picture, then renders the post page repeatedly for an anonymous
+visitor and for a logged-in one. Reports the median time and the number of
+SQL statements per request with the fragment cache disabled and warm.
+
+    python benchmarks/comment_thread.py [COMMENTS] [AUTHORS]
+"""
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event  # noqa: E402
+
+from app import create_app, db, fragment_cache  # noqa: E402
+from app.models import Category, Comment, Post, User  # noqa: E402
+from config import Config  # noqa: E402
+
+REPEAT = 30
+
+
+class BenchConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    WTF_CSRF_ENABLED = False
+    COMPRESS_ENABLED = False
+    RATELIMIT_ENABLED = False
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
+
+
+def seed(comments, authors):
+    rng = random.Random(0)
+    category = Category(name='Idea')
+    users = [User(username=f'user{i}', email=f'user{i}@example.com', confirmed=True, password_hash='x',
+                  profile_picture=f'user_{i}.jpg')
+             for i in range(authors)]
+    db.session.add(category)
+    db.session.add_all(users)
+    db.session.flush()
+    post = Post(title='Big thread', content='<p>Lorem ipsum</p>', author=users[0], category=category)
+    db.session.add(post)
+    db.session.flush()
+    start = datetime(2024, 1, 1)
+    ids = []
+    for i in range(comments):
+        parent_id = rng.choice(ids) if ids and rng.random() < 0.5 else None
+        comment = Comment(content=f'Comment number {i} ' * 5, author_id=users[i % authors].id, post_id=post.id,
+                          parent_id=parent_id, created_at=start + timedelta(seconds=i))
+        db.session.add(comment)
+        db.session.flush()
+        ids.append(comment.id)
+    db.session.commit()
+    return post.id, users[1].id
+
+
+def measure(client, url, engine):
+    statements = []
+
+    def count(*args):
+        statements.append(1)
+
+    times = []
+    event.listen(engine, 'before_cursor_execute', count)
+    try:
+        for _ in range(REPEAT):
+            statements.clear()
+            start = time.perf_counter()
+            response = client.get(url)
+            times.append((time.perf_counter() - start) * 1000)
+            assert response.status_code == 200
+    finally:
+        event.remove(engine, 'before_cursor_execute', count)
+    return statistics.median(times), len(statements)
+
+
+def main():
+    comments = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    authors = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        post_id, user_id = seed(comments, authors)
+        engine = db.engine
+    url = f'/post/{post_id}'
+
+    anonymous = app.test_client()
+    logged_in = app.test_client()
+    with logged_in.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+
+    print(f'{comments} comments by {authors} authors, median of {REPEAT} requests')
+    print(f'{"visitor":<12}{"fragment cache":<16}{"ms":>8}{"queries":>9}')
+    for name, client in (('anonymous', anonymous), ('logged in', logged_in)):
+        for label, size in (('off', 0), ('warm', app.config['FRAGMENT_CACHE_SIZE'])):
+            fragment_cache.configure(maxsize=size, ttl=app.config['FRAGMENT_CACHE_TTL'])
+            client.get(url)
+            ms, queries = measure(client, url, engine)
+            print(f'{name:<12}{label:<16}{ms:>8.1f}{queries:>9}')
+
+
+if __name__ == '__main__':
+    main()
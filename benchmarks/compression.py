@@ -0,0 +1,82 @@
+"""Bytes saved vs. CPU cost of response compression.
+
+Renders the feed and a large post thread from a throwaway in-memory
+database, then compresses each page with every gzip level / Brotli quality
+and reports size, ratio and compression time per response.
+
+    python benchmarks/compression.py
+"""
+import gzip
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app, db  # noqa: E402
+from app.models import Category, Comment, Post, User  # noqa: E402
+from config import Config  # noqa: E402
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+class BenchConfig(Config):
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    WTF_CSRF_ENABLED = False
+    COMPRESS_ENABLED = False
+    JINJA_BYTECODE_CACHE = False
+
+
+def seed():
+    category = Category(name='Idea')
+    users = [User(username=f'user{i}', email=f'user{i}@example.com', confirmed=True, password_hash='x')
+             for i in range(10)]
+    db.session.add(category)
+    db.session.add_all(users)
+    db.session.flush()
+    for i in range(30):
+        db.session.add(Post(title=f'Post {i}', content='<p>Lorem ipsum dolor sit amet.</p>' * 200,
+                            author=users[i % 10], category=category))
+    db.session.flush()
+    thread = db.session.scalar(db.select(Post).order_by(Post.id))
+    for i in range(300):
+        db.session.add(Comment(content=f'Comment number {i}', author=users[i % 10], post=thread))
+    db.session.commit()
+    return thread.id
+
+
+def timed(func, data, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        out = func(data)
+    return out, (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    app = create_app(BenchConfig)
+    with app.app_context():
+        db.create_all()
+        post_id = seed()
+    client = app.test_client()
+    pages = {'feed': '/', 'thread (300 comments)': f'/post/{post_id}'}
+
+    codecs = [(f'gzip-{level}', lambda d, level=level: gzip.compress(d, compresslevel=level, mtime=0))
+              for level in (1, 6, 9)]
+    if brotli is not None:
+        codecs += [(f'br-{quality}', lambda d, quality=quality: brotli.compress(d, quality=quality))
+                   for quality in (1, 4, 11)]
+
+    for name, url in pages.items():
+        body = client.get(url).get_data()
+        print(f'\n{name}: {len(body):,} bytes uncompressed')
+        print(f'{"codec":<10}{"bytes":>10}{"saved":>9}{"ms/resp":>10}')
+        for codec, compress in codecs:
+            out, ms = timed(compress, body)
+            print(f'{codec:<10}{len(out):>10,}{1 - len(out) / len(body):>9.1%}{ms:>10.3f}')
+
+
+if __name__ == '__main__':
+    main()
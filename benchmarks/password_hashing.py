@@ -0,0 +1,65 @@
+"""Login throughput per worker for each password hashing setting.
+
+A login costs one password verification, so verifications per second is the
+ceiling on logins per second for one worker. For every PASSWORD_HASH_METHOD
+candidate this reports the time per verification, then the throughput with
+PASSWORD_HASH_THREADS = 0 (hashing in the request thread) and with a pool of
+2 and 4 threads while as many request threads log in concurrently (as
+under `gunicorn --threads`).
+
+    python benchmarks/password_hashing.py [METHOD ...]
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.passwords import PasswordHasher  # noqa: E402
+
+METHODS = (
+    'scrypt:32768:8:1',
+    'scrypt:16384:8:1',
+    'pbkdf2:sha256:600000',
+    'pbkdf2:sha256:260000',
+    'pbkdf2:sha256:100000',
+)
+POOL_SIZES = (0, 2, 4)
+DURATION = 2.0
+
+
+def logins_per_second(method, threads):
+    hasher = PasswordHasher(SimpleNamespace(config={
+        'PASSWORD_HASH_METHOD': method,
+        'PASSWORD_HASH_THREADS': threads,
+    }))
+    pwhash = hasher.hash('correct horse battery staple')
+    deadline = time.perf_counter() + DURATION
+
+    def request_thread():
+        done = 0
+        while time.perf_counter() < deadline:
+            assert hasher.verify(pwhash, 'correct horse battery staple')
+            done += 1
+        return done
+
+    concurrency = max(threads, 1)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as clients:
+        done = sum(clients.map(lambda _: request_thread(), range(concurrency)))
+    return done / (time.perf_counter() - start)
+
+
+def main():
+    methods = sys.argv[1:] or METHODS
+    header = ''.join(f'{f"threads={n}":>12}' for n in POOL_SIZES)
+    print(f'{"method":<24}{"ms/login":>10}{header}   (logins/sec per worker)')
+    for method in methods:
+        rates = [logins_per_second(method, threads) for threads in POOL_SIZES]
+        print(f'{method:<24}{1000 / rates[0]:>10.1f}' + ''.join(f'{rate:>12.1f}' for rate in rates))
+
+
+if __name__ == '__main__':
+    main()
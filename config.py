@@ -11,6 +11,75 @@ class Config:
     
     POSTS_PER_PAGE = 10
 
+    # প্রতি worker এ লগইন করা ইউজারের ক্যাশ (সেকেন্ড এবং সর্বোচ্চ এন্ট্রি সংখ্যা)
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL') or 30)
+    USER_CACHE_SIZE = int(os.environ.get('USER_CACHE_SIZE') or 1024)
+
+    # পোস্ট কার্ড ও কমেন্টের রেন্ডার করা HTML এর ক্যাশ; key তে অবজেক্টের ভার্সন থাকে
+    FRAGMENT_CACHE_TTL = int(os.environ.get('FRAGMENT_CACHE_TTL') or 300)
+    FRAGMENT_CACHE_SIZE = int(os.environ.get('FRAGMENT_CACHE_SIZE') or 4096)
+    # কম্পাইল করা Jinja টেমপ্লেট instance/jinja_cache এ রাখা হয়
+    JINJA_BYTECODE_CACHE = os.environ.get('JINJA_BYTECODE_CACHE', 'True').lower() == 'true'
+
+    # রেসপন্স কম্প্রেশন (gzip/Brotli); এর চেয়ে ছোট রেসপন্স কম্প্রেস করা হয় না
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', 'True').lower() == 'true'
+    COMPRESS_MIN_SIZE = 500
+    COMPRESS_GZIP_LEVEL = 6
+    COMPRESS_BROTLI_QUALITY = 4
+    COMPRESS_MIMETYPES = [
+        'text/html', 'text/css', 'text/plain', 'text/javascript', 'application/javascript',
+        'application/json', 'application/x-ndjson', 'image/svg+xml',
+    ]
+
+    # রক্ষণাবেক্ষণ জব: `flask jobs run` (cron) অথবা প্রতিটি worker এ ইন-প্রসেস শিডিউলার
+    JOBS_SCHEDULER_ENABLED = os.environ.get('JOBS_SCHEDULER_ENABLED', 'False').lower() == 'true'
+    JOBS_POLL_INTERVAL = 60
+    JOBS_LEASE_SECONDS = 900
+    JOBS_UPLOAD_GRACE_SECONDS = 3600
+    NOTIFICATIONS_PER_USER = 150
+    SITE_STATS_MAX_AGE = 3600
+    # delta এক্সপোর্টের জন্য মুছে ফেলা সারির রেকর্ড এত দিন রাখা হয়; এর চেয়ে পুরোনো since এ পূর্ণ এক্সপোর্ট লাগবে
+    DELETED_ROWS_KEEP_DAYS = int(os.environ.get('DELETED_ROWS_KEEP_DAYS') or 90)
+
+    # লেখার endpoint গুলোর রেট লিমিট (token bucket, "N/second|minute|hour|day")
+    # memory = প্রতিটি worker আলাদা গোনে; sqlite = একই মেশিনের সব worker একটি লোকাল ফাইল শেয়ার করে
+    RATELIMIT_ENABLED = os.environ.get('RATELIMIT_ENABLED', 'True').lower() == 'true'
+    RATELIMIT_STORAGE = os.environ.get('RATELIMIT_STORAGE') or 'memory'
+    RATELIMIT_STORAGE_PATH = os.environ.get('RATELIMIT_STORAGE_PATH')
+    RATELIMIT_MEMORY_SIZE = 100000
+    RATELIMIT_POLICIES = {
+        'main.vote': '30/minute',
+        'main.post_detail': '10/minute',
+        'auth.login': '10/minute',
+        'main.reset_request': '5/hour',
+    }
+    # রিভার্স প্রক্সির (Render) পেছনে থাকলে আসল ক্লায়েন্ট IP পেতে X-Forwarded-For এর কয়টি hop বিশ্বাস করা হবে
+    PROXY_FIX_X_FOR = int(os.environ.get('PROXY_FIX_X_FOR') or 0)
+
+    # পাসওয়ার্ড হ্যাশের পদ্ধতি ও খরচ (Werkzeug method string); বদলালে পুরোনো হ্যাশ পরের লগইনে আপডেট হয়
+    # খরচ বনাম লগইন/সেকেন্ড দেখতে: python benchmarks/password_hashing.py
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD') or 'scrypt:32768:8:1'
+    # ০ হলে রিকোয়েস্ট থ্রেডেই হ্যাশ হয়; না হলে এতগুলো থ্রেডের পুলে (একসাথে এর বেশি হ্যাশ চলবে না)
+    PASSWORD_HASH_THREADS = int(os.environ.get('PASSWORD_HASH_THREADS') or 0)
+
+    # সার্চ সাজেশনের ইন-মেমরি প্রিফিক্স ইনডেক্স (প্রতি worker); সীমা মেমরি নিয়ন্ত্রণে রাখে
+    SUGGEST_MAX_POSTS = 20000
+    SUGGEST_MAX_USERS = 20000
+    SUGGEST_TITLE_WORDS = 6
+    SUGGEST_LIMIT = 5
+    # অন্য worker এর পরিবর্তন ধরতে এত সেকেন্ড পরপর ব্যাকগ্রাউন্ডে ইনডেক্স আবার তৈরি হয়
+    SUGGEST_REFRESH_INTERVAL = 600
+    # একই প্রিফিক্সের সাজেশন ব্রাউজার/প্রক্সি এত সেকেন্ড ক্যাশ করে রাখতে পারে
+    SUGGEST_CACHE_SECONDS = 60
+
+    # অ্যাডমিনদের জন্য রিকোয়েস্ট প্রোফাইলার: URL এ ?_profile=1 অথবা X-Profile হেডার দিলে
+    # সেই রিকোয়েস্টের cProfile ও স্ট্যাক স্যাম্পল instance/profiles এ জমা হয়
+    PROFILER_ENABLED = os.environ.get('PROFILER_ENABLED', 'True').lower() == 'true'
+    PROFILER_QUERY_ARG = '_profile'
+    PROFILER_HEADER = 'X-Profile'
+    PROFILER_SAMPLE_INTERVAL = 0.001
+    PROFILER_KEEP = 50
+
     # Flask-Mail কনফিগারেশন
     MAIL_SERVER = os.environ.get('MAIL_SERVER') or 'smtp.googlemail.com'
     MAIL_PORT = int(os.environ.get('MAIL_PORT') or 587)
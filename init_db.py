@@ -1,6 +1,10 @@
+from flask_migrate import stamp
+
 from app import create_app, db
 
 app = create_app()
 with app.app_context():
     db.create_all()
-    print("Database tables created successfully!")
\ No newline at end of file
+    # টেবিল এখনকার মডেল থেকেই তৈরি, তাই `flask db upgrade` যেন মাইগ্রেশনগুলো আবার না চালায়
+    stamp()
+    print("Database tables created successfully!")
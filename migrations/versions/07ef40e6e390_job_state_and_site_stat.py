@@ -0,0 +1,41 @@
+"""job state and site stats
+
+Revision ID: 07ef40e6e390
+Revises: 3fc019dabd8f
+Create Date: 2026-10-19 17:18:41.507322
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '07ef40e6e390'
+down_revision = '3fc019dabd8f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('job_state',
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('last_started_at', sa.Float(), nullable=True),
+        sa.Column('last_finished_at', sa.Float(), nullable=True),
+        sa.Column('last_status', sa.String(length=16), nullable=True),
+        sa.Column('last_duration', sa.Float(), nullable=True),
+        sa.Column('last_result_json', sa.Text(), nullable=True),
+        sa.Column('run_count', sa.Integer(), nullable=False),
+        sa.Column('lease_until', sa.Float(), nullable=True),
+        sa.PrimaryKeyConstraint('name')
+    )
+    op.create_table('site_stat',
+        sa.Column('key', sa.String(length=64), nullable=False),
+        sa.Column('value_json', sa.Text(), nullable=False),
+        sa.Column('updated_at', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade():
+    op.drop_table('site_stat')
+    op.drop_table('job_state')
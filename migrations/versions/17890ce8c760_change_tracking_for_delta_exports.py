@@ -0,0 +1,58 @@
+"""change tracking for delta exports
+
+Revision ID: 17890ce8c760
+Revises: 07ef40e6e390
+Create Date: 2026-10-19 17:41:15.733098
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '17890ce8c760'
+down_revision = '07ef40e6e390'
+branch_labels = None
+depends_on = None
+
+TRACKED_TABLES = ('user', 'post', 'comment', 'vote')
+# app/models.py এর trigger এর সাথে মিল রাখতে হবে
+TRIGGER = (
+    'CREATE TRIGGER IF NOT EXISTS trg_{table}_deleted AFTER DELETE ON "{table}" BEGIN '
+    "INSERT INTO deleted_row (table_name, row_id, deleted_at) "
+    "VALUES ('{table}', OLD.id, strftime('%Y-%m-%d %H:%M:%f', 'now')); END"
+)
+
+
+def upgrade():
+    for table in TRACKED_TABLES:
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+        # আগের সারিগুলো তৈরির সময় থেকে অপরিবর্তিত; vote এ created_at নেই তাই NULL থাকে
+        if table != 'vote':
+            op.execute(f'UPDATE "{table}" SET updated_at = created_at')
+        op.create_index(f'ix_{table}_updated_at', table, ['updated_at'], unique=False)
+
+    op.create_table('deleted_row',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('table_name', sa.String(length=32), nullable=False),
+        sa.Column('row_id', sa.Integer(), nullable=False),
+        sa.Column('deleted_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_deleted_row_deleted_at', 'deleted_row', ['deleted_at'], unique=False)
+    if op.get_bind().dialect.name == 'sqlite':
+        for table in TRACKED_TABLES:
+            op.execute(TRIGGER.format(table=table))
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        for table in TRACKED_TABLES:
+            op.execute(f'DROP TRIGGER IF EXISTS trg_{table}_deleted')
+    op.drop_index('ix_deleted_row_deleted_at', table_name='deleted_row')
+    op.drop_table('deleted_row')
+    for table in reversed(TRACKED_TABLES):
+        op.drop_index(f'ix_{table}_updated_at', table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column('updated_at')
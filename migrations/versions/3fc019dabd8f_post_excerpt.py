@@ -0,0 +1,27 @@
+"""post excerpt
+
+Revision ID: 3fc019dabd8f
+Revises: dce5ab42e777
+Create Date: 2026-10-19 17:02:26.154870
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3fc019dabd8f'
+down_revision = 'dce5ab42e777'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # পুরোনো পোস্টগুলো খালি excerpt পায়; `flask backfill-excerpts` পরে সেগুলো ভরে দেয়
+    with op.batch_alter_table('post') as batch_op:
+        batch_op.add_column(sa.Column('excerpt', sa.String(length=200), server_default='', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('post') as batch_op:
+        batch_op.drop_column('excerpt')
@@ -0,0 +1,42 @@
+"""null excerpt until backfilled
+
+Revision ID: 5c2a9d1f7b34
+Revises: 17890ce8c760
+Create Date: 2026-10-19 19:12:07.381554
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c2a9d1f7b34'
+down_revision = '17890ce8c760'
+branch_labels = None
+depends_on = None
+
+# batch মোডে SQLite টেবিলটি নতুন করে তৈরি করে, তাতে টেবিলের trigger মুছে যায়
+POST_TRIGGER = (
+    'CREATE TRIGGER IF NOT EXISTS trg_post_deleted AFTER DELETE ON "post" BEGIN '
+    "INSERT INTO deleted_row (table_name, row_id, deleted_at) "
+    "VALUES ('post', OLD.id, strftime('%Y-%m-%d %H:%M:%f', 'now')); END"
+)
+
+
+def upgrade():
+    # খালি excerpt ছবি-শুধু পোস্টেরও হতে পারে; NULL মানে "এখনো তৈরি হয়নি", তাই backfill প্রতিটি সারি একবারই ধরে
+    with op.batch_alter_table('post') as batch_op:
+        batch_op.alter_column('excerpt', existing_type=sa.String(length=200),
+                              nullable=True, existing_server_default='', server_default=None)
+    op.execute("UPDATE post SET excerpt = NULL WHERE excerpt = ''")
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute(POST_TRIGGER)
+
+
+def downgrade():
+    op.execute("UPDATE post SET excerpt = '' WHERE excerpt IS NULL")
+    with op.batch_alter_table('post') as batch_op:
+        batch_op.alter_column('excerpt', existing_type=sa.String(length=200),
+                              nullable=False, server_default='')
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute(POST_TRIGGER)
@@ -0,0 +1,109 @@
+"""baseline schema
+
+Revision ID: 86bb14ed0439
+Revises: 
+Create Date: 2026-10-19 16:05:12.418301
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '86bb14ed0439'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # এই রিভিশনের আগের ডাটাবেস db.create_all() দিয়ে তৈরি, তাই শুধু যে টেবিল নেই সেগুলো তৈরি হয়
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'user' not in existing:
+        op.create_table('user',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('username', sa.String(length=64), nullable=False),
+            sa.Column('email', sa.String(length=120), nullable=False),
+            sa.Column('password_hash', sa.String(length=256), nullable=False),
+            sa.Column('bio', sa.Text(), nullable=True),
+            sa.Column('profile_picture', sa.String(length=120), nullable=True),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('confirmed', sa.Boolean(), nullable=False),
+            sa.Column('telegram_link', sa.String(length=120), nullable=True),
+            sa.Column('last_notification_read_time', sa.Float(), nullable=True),
+            sa.Column('is_admin', sa.Boolean(), nullable=False),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_user_username', 'user', ['username'], unique=True)
+        op.create_index('ix_user_email', 'user', ['email'], unique=True)
+
+    if 'category' not in existing:
+        op.create_table('category',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=50), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('name')
+        )
+
+    if 'post' not in existing:
+        op.create_table('post',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('title', sa.String(length=100), nullable=False),
+            sa.Column('content', sa.Text(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('image', sa.String(length=120), nullable=True),
+            sa.Column('author_id', sa.Integer(), nullable=False),
+            sa.Column('category_id', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['author_id'], ['user.id']),
+            sa.ForeignKeyConstraint(['category_id'], ['category.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_post_title', 'post', ['title'], unique=False)
+
+    if 'notification' not in existing:
+        op.create_table('notification',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=128), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('timestamp', sa.Float(), nullable=False),
+            sa.Column('payload_json', sa.Text(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_notification_timestamp', 'notification', ['timestamp'], unique=False)
+
+    if 'vote' not in existing:
+        op.create_table('vote',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.Column('post_id', sa.Integer(), nullable=False),
+            sa.Column('vote_type', sa.String(length=10), nullable=False),
+            sa.ForeignKeyConstraint(['post_id'], ['post.id']),
+            sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('user_id', 'post_id', name='_user_post_uc')
+        )
+
+    if 'comment' not in existing:
+        op.create_table('comment',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('content', sa.Text(), nullable=False),
+            sa.Column('created_at', sa.DateTime(), nullable=False),
+            sa.Column('author_id', sa.Integer(), nullable=False),
+            sa.Column('post_id', sa.Integer(), nullable=False),
+            sa.Column('parent_id', sa.Integer(), nullable=True),
+            sa.ForeignKeyConstraint(['author_id'], ['user.id']),
+            sa.ForeignKeyConstraint(['parent_id'], ['comment.id']),
+            sa.ForeignKeyConstraint(['post_id'], ['post.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+
+def downgrade():
+    op.drop_table('comment')
+    op.drop_table('vote')
+    op.drop_table('notification')
+    op.drop_table('post')
+    op.drop_table('category')
+    op.drop_table('user')
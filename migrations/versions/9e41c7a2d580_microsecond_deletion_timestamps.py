@@ -0,0 +1,45 @@
+"""microsecond deletion timestamps
+
+Revision ID: 9e41c7a2d580
+Revises: 5c2a9d1f7b34
+Create Date: 2026-10-19 19:48:31.204417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e41c7a2d580'
+down_revision = '5c2a9d1f7b34'
+branch_labels = None
+depends_on = None
+
+TRACKED_TABLES = ('user', 'post', 'comment', 'vote')
+# app/models.py এর trigger এর সাথে মিল রাখতে হবে
+TRIGGER = (
+    'CREATE TRIGGER trg_{table}_deleted AFTER DELETE ON "{table}" BEGIN '
+    "INSERT INTO deleted_row (table_name, row_id, deleted_at) "
+    "VALUES ('{table}', OLD.id, strftime('%Y-%m-%d %H:%M:%f', 'now'){suffix}); END"
+)
+
+
+def _recreate_triggers(suffix):
+    for table in TRACKED_TABLES:
+        op.execute(f'DROP TRIGGER IF EXISTS trg_{table}_deleted')
+        op.execute(TRIGGER.format(table=table, suffix=suffix))
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    # '%f' তিন অঙ্কের ভগ্নাংশ দেয়, SQLAlchemy ছয় অঙ্কে তুলনা করে; স্ট্রিং তুলনায় একই মিলিসেকেন্ডের সারি বাদ পড়ত
+    _recreate_triggers(" || '000'")
+    op.execute("UPDATE deleted_row SET deleted_at = deleted_at || '000' WHERE length(deleted_at) = 23")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    _recreate_triggers('')
+    op.execute("UPDATE deleted_row SET deleted_at = substr(deleted_at, 1, 23) WHERE length(deleted_at) = 26")
@@ -0,0 +1,46 @@
+"""ON DELETE CASCADE for post threads, comment author index
+
+Revision ID: ab459bed8632
+Revises: 86bb14ed0439
+Create Date: 2026-10-19 16:07:40.902117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ab459bed8632'
+down_revision = '86bb14ed0439'
+branch_labels = None
+depends_on = None
+
+# পুরোনো foreign key গুলোর নাম নেই; reflect করার সময় এই নাম দিলে এগুলো drop করা যায়
+NAMING_CONVENTION = {'fk': 'fk_%(table_name)s_%(column_0_name)s_%(referred_table_name)s'}
+CASCADES = {
+    'post': [('author_id', 'user')],
+    'vote': [('user_id', 'user'), ('post_id', 'post')],
+    'comment': [('author_id', 'user'), ('post_id', 'post'), ('parent_id', 'comment')],
+    'notification': [('user_id', 'user')],
+}
+
+
+def _rebuild_foreign_keys(ondelete):
+    # SQLite constraint বদলাতে পারে না, তাই batch মোডে টেবিল নতুন করে তৈরি হয় (env.py তখন foreign key বন্ধ রাখে)
+    for table, foreign_keys in CASCADES.items():
+        with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch_op:
+            for column, referred in foreign_keys:
+                batch_op.drop_constraint(f'fk_{table}_{column}_{referred}', type_='foreignkey')
+                batch_op.create_foreign_key(f'fk_{table}_{column}_{referred}', referred, [column], ['id'], ondelete=ondelete)
+
+
+def upgrade():
+    _rebuild_foreign_keys('CASCADE')
+    op.create_index('ix_comment_parent_id', 'comment', ['parent_id'], unique=False, if_not_exists=True)
+    op.create_index('ix_comment_author_id', 'comment', ['author_id'], unique=False, if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index('ix_comment_author_id', table_name='comment')
+    op.drop_index('ix_comment_parent_id', table_name='comment')
+    _rebuild_foreign_keys(None)
@@ -0,0 +1,36 @@
+"""indexes for hot queries
+
+Revision ID: b64587df7e5e
+Revises: ab459bed8632
+Create Date: 2026-10-19 16:31:08.220764
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b64587df7e5e'
+down_revision = 'ab459bed8632'
+branch_labels = None
+depends_on = None
+
+# `flask create-indexes` আগে চালানো থাকলে এগুলো আগেই থাকতে পারে
+INDEXES = [
+    ('ix_post_created_at', 'post', ['created_at']),
+    ('ix_post_category_id_created_at', 'post', ['category_id', 'created_at']),
+    ('ix_post_author_id_created_at', 'post', ['author_id', 'created_at']),
+    ('ix_comment_post_id_parent_id_created_at', 'comment', ['post_id', 'parent_id', 'created_at']),
+    ('ix_vote_post_id_vote_type', 'vote', ['post_id', 'vote_type']),
+    ('ix_notification_user_id_timestamp', 'notification', ['user_id', 'timestamp']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
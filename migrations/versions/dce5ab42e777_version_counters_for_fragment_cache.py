@@ -0,0 +1,30 @@
+"""version counters for the fragment cache
+
+Revision ID: dce5ab42e777
+Revises: b64587df7e5e
+Create Date: 2026-10-19 16:48:53.671930
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'dce5ab42e777'
+down_revision = 'b64587df7e5e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('post') as batch_op:
+        batch_op.add_column(sa.Column('version_id', sa.Integer(), server_default='1', nullable=False))
+    with op.batch_alter_table('comment') as batch_op:
+        batch_op.add_column(sa.Column('version_id', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('comment') as batch_op:
+        batch_op.drop_column('version_id')
+    with op.batch_alter_table('post') as batch_op:
+        batch_op.drop_column('version_id')
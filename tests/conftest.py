@@ -0,0 +1,84 @@
+import pytest
+
+from app import create_app, db
+from app.jobs import refresh_site_stats
+from app.models import Category, Comment, Post, User, Vote
+from config import Config
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    WTF_CSRF_ENABLED = False
+
+
+@pytest.fixture(scope='session')
+def app():
+    # create_app() একবারই ডাকা যায়, কারণ গ্লোবাল admin অবজেক্টে ভিউ আবার যোগ করা যায় না
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        _seed()
+    return app
+
+
+def _seed():
+    idea = Category(name='Idea')
+    story = Category(name='Horror')
+    alice = User(username='alice', email='alice@example.com', confirmed=True)
+    bob = User(username='bob', email='bob@example.com', confirmed=True)
+    alice.set_password('password')
+    bob.set_password('password')
+    db.session.add_all([idea, story, alice, bob])
+    db.session.flush()
+
+    for i in range(6):
+        post = Post(title=f'Post {i}', content='Lorem ipsum ' * 50,
+                    author=alice if i % 2 else bob, category=idea if i % 3 else story)
+        db.session.add(post)
+        db.session.flush()
+        top = Comment(content='Top level', author=bob, post=post)
+        db.session.add(top)
+        db.session.flush()
+        db.session.add(Comment(content='Reply', author=alice, post=post, parent_id=top.id))
+        db.session.add(Vote(user_id=bob.id, post_id=post.id, vote_type='like'))
+    alice.add_notification('new_like', {'liker_username': 'bob', 'post_id': 1, 'post_title': 'Post 1'})
+    db.session.commit()
+    # প্রোডাকশনে refresh-site-stats জব সাইডবারের পরিসংখ্যান আগেই তৈরি রাখে
+    refresh_site_stats()
+
+
+@pytest.fixture()
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture()
+def engine(app):
+    with app.app_context():
+        return db.engine
+
+
+@pytest.fixture()
+def login(app, client):
+    def _login(username):
+        with app.app_context():
+            user = db.session.scalar(db.select(User).where(User.username == username))
+        with client.session_transaction() as session:
+            session['_user_id'] = str(user.id)
+            session['_fresh'] = True
+        return user
+    return _login
+
+
+@pytest.fixture()
+def admin(app, login):
+    def _admin():
+        with app.app_context():
+            if db.session.scalar(db.select(User).where(User.username == 'admin')) is None:
+                user = User(username='admin', email='admin@example.com', confirmed=True, is_admin=True)
+                user.set_password('password')
+                db.session.add(user)
+                db.session.commit()
+        return login('admin')
+    return _admin
@@ -0,0 +1,113 @@
+import gzip
+import json
+import os
+
+import brotli
+import pytest
+
+from app import compress
+
+SCRIPT = b'function hello() { return "hello world"; }\n' * 50
+
+
+@pytest.fixture()
+def static_folder(app, tmp_path, monkeypatch):
+    # app/static/js এ আগের বিল্ডের .gz/.br পড়ে থাকতে পারে, তাই আলাদা ফোল্ডার
+    monkeypatch.setattr(app, 'static_folder', str(tmp_path))
+    (tmp_path / 'js').mkdir()
+    source = tmp_path / 'js' / 'app.js'
+    source.write_bytes(SCRIPT)
+    (tmp_path / 'js' / 'app.js.gz').write_bytes(gzip.compress(SCRIPT))
+    (tmp_path / 'js' / 'app.js.br').write_bytes(brotli.compress(SCRIPT))
+    return tmp_path
+
+
+def _age(path, seconds):
+    mtime = os.path.getmtime(path) - seconds
+    os.utime(path, (mtime, mtime))
+
+
+def _decompress(response):
+    encoding = response.headers.get('Content-Encoding')
+    if encoding == 'br':
+        return brotli.decompress(response.get_data())
+    if encoding == 'gzip':
+        return gzip.decompress(response.get_data())
+    return response.get_data()
+
+
+@pytest.mark.parametrize('accept, expected', [
+    ('gzip, br', 'br'),
+    ('gzip;q=1.0, br;q=1.0', 'br'),
+    ('br;q=0.5, gzip', 'gzip'),
+    ('*', 'br'),
+    ('identity', None),
+    ('gzip;q=0, br;q=0', None),
+])
+def test_negotiate(app, accept, expected):
+    with app.test_request_context(headers={'Accept-Encoding': accept}):
+        assert compress.negotiate() == expected
+
+
+@pytest.mark.parametrize('encoding', ['br', 'gzip'])
+def test_page_is_compressed(client, encoding):
+    response = client.get('/', headers={'Accept-Encoding': encoding})
+    assert response.headers['Content-Encoding'] == encoding
+    assert 'Accept-Encoding' in response.vary
+    assert b'</html>' in _decompress(response)
+
+
+def test_small_or_unrequested_response_is_not_compressed(app, client, monkeypatch):
+    response = client.get('/')
+    assert 'Content-Encoding' not in response.headers
+    assert 'Accept-Encoding' in response.vary
+
+    monkeypatch.setitem(app.config, 'COMPRESS_MIN_SIZE', len(response.get_data()) + 1)
+    response = client.get('/', headers={'Accept-Encoding': 'gzip, br'})
+    assert 'Content-Encoding' not in response.headers
+    assert 'Accept-Encoding' in response.vary
+
+
+@pytest.mark.parametrize('encoding', ['br', 'gzip'])
+def test_streamed_export_decompresses_to_same_rows(client, admin, encoding):
+    admin()
+
+    def rows(data):
+        # _meta লাইনে exported_at থাকে, যা প্রতিটি রিকোয়েস্টে আলাদা
+        return [line for line in data.splitlines() if json.loads(line)['table'] != '_meta']
+
+    plain = client.get('/admin/export/download?tables=posts&tables=comments')
+    response = client.get('/admin/export/download?tables=posts&tables=comments',
+                          headers={'Accept-Encoding': encoding})
+    assert response.is_streamed
+    assert response.headers['Content-Encoding'] == encoding
+    assert 'Content-Length' not in response.headers
+    assert rows(_decompress(response)) == rows(plain.get_data())
+
+
+def test_fresh_precompressed_static_is_served(client, static_folder):
+    plain = client.get('/static/js/app.js')
+    assert 'Content-Encoding' not in plain.headers
+
+    for accept, encoding in (('gzip, br', 'br'), ('gzip', 'gzip')):
+        response = client.get('/static/js/app.js', headers={'Accept-Encoding': accept})
+        assert response.headers['Content-Encoding'] == encoding
+        assert response.mimetype == plain.mimetype
+        assert 'Accept-Encoding' in response.vary
+        assert _decompress(response) == SCRIPT
+        response.close()
+    plain.close()
+
+
+def test_stale_precompressed_static_is_not_served(client, static_folder):
+    _age(static_folder / 'js' / 'app.js.br', 60)
+    response = client.get('/static/js/app.js', headers={'Accept-Encoding': 'gzip, br'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert _decompress(response) == SCRIPT
+    response.close()
+
+    _age(static_folder / 'js' / 'app.js.gz', 60)
+    response = client.get('/static/js/app.js', headers={'Accept-Encoding': 'gzip, br'})
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_data() == SCRIPT
+    response.close()
@@ -0,0 +1,99 @@
+import json
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+
+from app import db
+from app.export import iter_ndjson
+from app.models import Comment, Post, User
+from app.moderation import delete_posts
+from tests.test_query_plans import captured_statements, plan_problems
+
+
+def _export(app, *args):
+    result = app.test_cli_runner().invoke(args=['export', *args])
+    assert result.exit_code == 0, result.output
+    return [json.loads(line) for line in result.output.splitlines()]
+
+
+def test_full_export_streams_every_row(app):
+    lines = _export(app, 'users', 'posts', '--batch-size', '2')
+    assert lines[0]['table'] == '_meta' and lines[0]['tables'] == ['users', 'posts']
+    with app.app_context():
+        post_ids = db.session.scalars(select(Post.id).order_by(Post.id)).all()
+    assert [line['data']['id'] for line in lines if line['table'] == 'posts'] == post_ids
+    assert all('password_hash' not in line['data'] for line in lines if line['table'] == 'users')
+    assert not any('deleted' in line for line in lines)
+
+
+def test_since_exports_changes_and_deletions(app):
+    with app.app_context():
+        author_id = db.session.scalar(select(User.id).where(User.username == 'bob'))
+        doomed = Post(title='Soon gone', content='Lorem', author_id=author_id, category_id=1)
+        db.session.add(doomed)
+        db.session.commit()
+        doomed_id = doomed.id
+        time.sleep(0.01)
+        since = datetime.now(timezone.utc)
+        time.sleep(0.01)
+
+        created = [Post(title=f'Delta {i}', content='Lorem', author_id=author_id, category_id=1) for i in range(3)]
+        db.session.add_all(created)
+        edited = db.session.scalar(select(Post).order_by(Post.id))
+        edited.title = 'Edited after the last export'
+        db.session.commit()
+        expected = sorted([edited.id] + [post.id for post in created])
+        delete_posts([doomed_id])
+
+    lines = _export(app, 'posts', '--since', since.isoformat(), '--batch-size', '1')
+    assert lines[0]['since'] == since.isoformat()
+    deleted = [line['deleted']['id'] for line in lines if 'deleted' in line]
+    changed = [line['data']['id'] for line in lines if 'data' in line]
+    assert deleted == [doomed_id]
+    assert sorted(changed) == expected and len(changed) == len(set(changed))
+    # tombstone আগে আসে, যাতে একই id পাওয়া নতুন সারি পরে প্রয়োগ হয়
+    assert lines.index(next(line for line in lines if 'deleted' in line)) < lines.index(
+        next(line for line in lines if 'data' in line))
+
+
+def test_since_exports_every_deletion_of_one_statement(app):
+    # একটি DELETE এর সব tombstone এর deleted_at একই, তাই সেগুলো batch_size এর বেশি হলেও সব আসতে হবে
+    with app.app_context():
+        author_id = db.session.scalar(select(User.id).where(User.username == 'bob'))
+        post = Post(title='Busy and doomed', content='Lorem', author_id=author_id, category_id=1)
+        db.session.add(post)
+        db.session.flush()
+        comments = [Comment(content=f'Comment {i}', author_id=author_id, post_id=post.id) for i in range(50)]
+        db.session.add_all(comments)
+        db.session.commit()
+        post_id, comment_ids = post.id, sorted(comment.id for comment in comments)
+        since = datetime.now(timezone.utc)
+        delete_posts([post_id])
+
+        export = ''.join(iter_ndjson(['comments', 'posts'], since, batch_size=10))
+    lines = [json.loads(line) for line in export.splitlines()]
+    assert sorted(line['deleted']['id'] for line in lines if line['table'] == 'comments' and 'deleted' in line) == comment_ids
+    assert [line['deleted']['id'] for line in lines if line['table'] == 'posts' and 'deleted' in line] == [post_id]
+
+
+def test_delta_export_uses_indexes(app, engine):
+    since = datetime(2024, 1, 1)
+    with app.app_context(), captured_statements(engine) as statements:
+        for _ in iter_ndjson(since=since, batch_size=2):
+            pass
+    assert len(statements) > 4
+    assert plan_problems(engine, statements) == []
+
+
+def test_admin_export_rejects_empty_selection(client, admin):
+    admin()
+
+    response = client.get('/admin/export/download')
+    assert response.status_code == 302 and response.headers['Location'].endswith('/admin/export/')
+
+    response = client.get('/admin/export/download?tables=posts')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    tables = {json.loads(line)['table'] for line in response.get_data(as_text=True).splitlines()}
+    assert tables == {'_meta', 'posts'}
@@ -0,0 +1,80 @@
+from sqlalchemy import event, select
+
+from app import db
+from app.models import Comment, Post, User
+from app.moderation import delete_posts
+
+
+def test_edited_comment_is_rendered_again(app, client):
+    with app.app_context():
+        comment = db.session.scalar(select(Comment).order_by(Comment.id))
+        post_id, comment_id = comment.post_id, comment.id
+    # post_detail এর রেট লিমিট অন্য টেস্টের সাথে শেয়ার না হওয়ার জন্য আলাদা IP
+    client.environ_base['REMOTE_ADDR'] = '10.0.30.1'
+    assert b'Edited by a moderator' not in client.get(f'/post/{post_id}').data
+
+    with app.app_context():
+        db.session.get(Comment, comment_id).content = 'Edited by a moderator'
+        db.session.commit()
+    assert b'Edited by a moderator' in client.get(f'/post/{post_id}').data
+
+
+def test_post_detail_queries_do_not_grow_with_the_thread(app, client, engine):
+    with app.app_context():
+        user_ids = db.session.scalars(select(User.id).order_by(User.id)).all()
+        post = Post(title='Busy thread', content='Lorem', author_id=user_ids[0], category_id=1)
+        db.session.add(post)
+        db.session.commit()
+        post_id = post.id
+    statements = []
+
+    def count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', count)
+    client.environ_base['REMOTE_ADDR'] = '10.0.30.2'
+    try:
+        client.get(f'/post/{post_id}')
+        empty_thread = len(statements)
+
+        with app.app_context():
+            parent_id = None
+            # কয়েক স্তরের রিপ্লাই, ভিন্ন ভিন্ন লেখক — লেভেল বা লেখক প্রতি কোয়েরি হলে সংখ্যা বাড়ত
+            for depth in range(6):
+                for user_id in user_ids:
+                    comment = Comment(content=f'Reply {depth}', author_id=user_id, post_id=post_id, parent_id=parent_id)
+                    db.session.add(comment)
+                    db.session.flush()
+                parent_id = comment.id
+            db.session.commit()
+        statements.clear()
+        body = client.get(f'/post/{post_id}').data
+    finally:
+        event.remove(engine, 'before_cursor_execute', count)
+    assert body.count(b'id="reply-slot-') == 6 * len(user_ids)
+    # থ্রেডের জন্য শুধু লেখকদের একটি অতিরিক্ত কোয়েরি
+    assert len(statements) <= empty_thread + 1
+
+
+def test_reused_post_id_is_not_served_from_cache(app, client):
+    # SQLite সবচেয়ে বড় id মুছে ফেলার পর সেটি নতুন সারিকে আবার দেয়
+    with app.app_context():
+        alice_id = db.session.scalar(select(User.id).where(User.username == 'alice'))
+        first = Post(title='First occupant', content='Lorem', author_id=alice_id, category_id=1)
+        db.session.add(first)
+        db.session.commit()
+        first_id = first.id
+    assert b'First occupant' in client.get('/').data
+
+    with app.app_context():
+        delete_posts([first_id])
+        second = Post(title='Second occupant', content='Lorem', author_id=alice_id, category_id=1)
+        db.session.add(second)
+        db.session.commit()
+        assert second.id == first_id and second.version_id == 1
+        second_id = second.id
+    body = client.get('/').data
+    assert b'Second occupant' in body and b'First occupant' not in body
+
+    with app.app_context():
+        delete_posts([second_id])
@@ -0,0 +1,70 @@
+import os
+import time
+
+import pytest
+from sqlalchemy import select, update
+
+from app import db
+from app.jobs import Job, _claim, dedupe_post_images, run_job, sweep_orphaned_uploads
+from app.models import JobState, Post, User
+from app.moderation import delete_posts
+
+
+def test_lease_lets_one_worker_run_a_job(app):
+    calls = []
+    job = Job('test-lease', lambda: calls.append(1) or {'done': True}, interval=3600)
+    with app.app_context():
+        assert _claim(job, force=False)
+        # অন্য worker লিজ শেষ না হওয়া পর্যন্ত জবটি নিতে পারে না, force দিলেও না
+        assert not _claim(job, force=False)
+        assert not _claim(job, force=True)
+        assert run_job(job) is None and calls == []
+
+        db.session.execute(update(JobState).where(JobState.name == job.name).values(lease_until=time.time() - 1))
+        db.session.commit()
+        assert run_job(job) == {'done': True} and calls == [1]
+        state = db.session.get(JobState, job.name)
+        assert state.lease_until is None and state.run_count == 1 and state.last_status == 'ok'
+
+        # interval পার না হলে আবার চলে না
+        assert run_job(job) is None and calls == [1]
+
+
+@pytest.fixture()
+def uploads(app, tmp_path, monkeypatch):
+    monkeypatch.setattr(app, 'root_path', str(tmp_path))
+    folder = tmp_path / 'static/uploads/posts'
+    folder.mkdir(parents=True)
+    old = time.time() - 2 * app.config['JOBS_UPLOAD_GRACE_SECONDS']
+
+    def write(name, data):
+        path = folder / name
+        path.write_bytes(data)
+        os.utime(path, (old, old))
+    return folder, write
+
+
+def test_dedupe_keeps_a_referenced_file_for_sweep(app, uploads):
+    folder, write = uploads
+    for name in ('a.jpg', 'b.jpg', 'c.jpg'):
+        write(name, b'same image')
+    for name in ('orphan1.jpg', 'orphan2.jpg'):
+        write(name, b'unused image')
+    with app.app_context():
+        author_id = db.session.scalar(select(User.id).where(User.username == 'alice'))
+        posts = [Post(title=f'Photo {name}', content='Lorem', image=name, author_id=author_id, category_id=1)
+                 for name in ('b.jpg', 'c.jpg')]
+        db.session.add_all(posts)
+        db.session.commit()
+        post_ids = [post.id for post in posts]
+
+        # a.jpg কেউ ব্যবহার করে না, তাই সেটি canonical হতে পারে না যদিও নাম অনুযায়ী প্রথম
+        assert dedupe_post_images() == {'duplicates': 2, 'bytes_freed': 2 * len(b'same image')}
+        assert sorted(os.listdir(folder)) == ['b.jpg', 'orphan1.jpg', 'orphan2.jpg']
+        assert set(db.session.scalars(select(Post.image).where(Post.id.in_(post_ids)))) == {'b.jpg'}
+
+        assert sweep_orphaned_uploads()['removed'] == 2
+        assert os.listdir(folder) == ['b.jpg']
+
+        delete_posts(post_ids)
+        assert os.listdir(folder) == []
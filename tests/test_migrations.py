@@ -0,0 +1,96 @@
+"""Upgrade a database created before the migrations existed.
+
+The migrations run in a separate ``flask db upgrade`` process, since the
+test app is bound to its own in-memory database.
+"""
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = '86bb14ed0439'
+
+
+def flask_db(database, *args):
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{database}', JOBS_SCHEDULER_ENABLED='false')
+    subprocess.run([sys.executable, '-m', 'flask', '--app', 'run.py', 'db', *args],
+                   cwd=ROOT, env=env, check=True, capture_output=True)
+
+
+@pytest.fixture(scope='module')
+def upgraded_db(tmp_path_factory):
+    database = str(tmp_path_factory.mktemp('migrations') / 'forum.db')
+    flask_db(database, 'upgrade', BASELINE)
+    conn = sqlite3.connect(database)
+    conn.execute("INSERT INTO user VALUES (1, 'alice', 'alice@example.com', 'x', NULL, NULL, "
+                 "'2024-01-01 00:00:00', 1, NULL, NULL, 0)")
+    conn.execute("INSERT INTO user VALUES (2, 'bob', 'bob@example.com', 'x', NULL, NULL, "
+                 "'2024-01-01 00:00:00', 1, NULL, NULL, 0)")
+    conn.execute("INSERT INTO category VALUES (1, 'Idea')")
+    conn.execute("INSERT INTO post VALUES (1, 'Hello', 'Lorem ipsum', '2024-01-02 00:00:00', NULL, 1, 1)")
+    conn.execute("INSERT INTO comment VALUES (1, 'Top', '2024-01-03 00:00:00', 2, 1, NULL)")
+    conn.execute("INSERT INTO comment VALUES (2, 'Reply', '2024-01-03 00:01:00', 1, 1, 1)")
+    conn.execute("INSERT INTO vote VALUES (1, 2, 1, 'like')")
+    conn.execute("INSERT INTO notification VALUES (1, 'new_like', 1, 1704067200.0, '{}')")
+    conn.commit()
+    conn.close()
+    flask_db(database, 'upgrade')
+    return database
+
+
+def _count(conn, table):
+    return conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+
+
+def test_upgrade_keeps_rows(upgraded_db):
+    conn = sqlite3.connect(upgraded_db)
+    assert [_count(conn, table) for table in ('user', 'post', 'comment', 'vote', 'notification')] == [2, 1, 2, 1, 1]
+
+
+def test_upgrade_adds_cascades(upgraded_db):
+    conn = sqlite3.connect(upgraded_db)
+    conn.execute('PRAGMA foreign_keys=ON')
+    conn.execute('DELETE FROM user WHERE id = 1')
+    assert [_count(conn, table) for table in ('post', 'comment', 'vote', 'notification')] == [0, 0, 0, 0]
+
+
+def test_upgrade_creates_model_indexes(upgraded_db):
+    from app import db
+
+    conn = sqlite3.connect(upgraded_db)
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    expected = {index.name for table in db.metadata.sorted_tables for index in table.indexes}
+    assert expected - existing == set()
+
+
+def test_upgraded_schema_matches_models(upgraded_db):
+    from alembic.autogenerate import compare_metadata
+    from alembic.migration import MigrationContext
+    from sqlalchemy import create_engine
+
+    from app import db
+
+    engine = create_engine(f'sqlite:///{upgraded_db}')
+    with engine.connect() as conn:
+        assert compare_metadata(MigrationContext.configure(conn), db.metadata) == []
+    engine.dispose()
+
+
+def test_upgrade_tracks_changes_for_delta_exports(upgraded_db):
+    conn = sqlite3.connect(upgraded_db)
+    assert conn.execute('SELECT updated_at FROM post').fetchone() == ('2024-01-02 00:00:00',)
+    conn.execute('PRAGMA foreign_keys=ON')
+    conn.execute('DELETE FROM post WHERE id = 1')
+    assert sorted(conn.execute('SELECT table_name, row_id FROM deleted_row')) == [
+        ('comment', 1), ('comment', 2), ('post', 1), ('vote', 1),
+    ]
+    # SQLAlchemy এর মতো ছয় অঙ্কের ভগ্নাংশ
+    assert {len(row[0]) for row in conn.execute('SELECT deleted_at FROM deleted_row')} == {26}
+
+
+def test_upgrade_leaves_old_excerpts_for_backfill(upgraded_db):
+    conn = sqlite3.connect(upgraded_db)
+    assert conn.execute('SELECT excerpt FROM post').fetchall() == [(None,)]
@@ -0,0 +1,97 @@
+from datetime import datetime
+
+from sqlalchemy import func, select
+
+from app import db
+from app.models import Comment, Notification, Post, User, Vote
+from app.moderation import delete_comments, delete_posts, purge_users
+
+
+def _count(model, *conditions):
+    return db.session.scalar(select(func.count()).select_from(model).where(*conditions))
+
+
+def test_purge_users_removes_content_and_replies(app):
+    with app.app_context():
+        bob = db.session.scalar(select(User).where(User.username == 'bob'))
+        spammer = User(username='spammer', email='spammer@example.com')
+        spammer.set_password('password')
+        db.session.add(spammer)
+        db.session.flush()
+        other_post = db.session.scalar(select(Post).where(Post.author_id == bob.id))
+        post = Post(title='Spam', content='Buy now', author=spammer, category_id=1)
+        db.session.add(post)
+        db.session.flush()
+        # অন্য ইউজারের উত্তরও মুছে যাওয়ার কথা, কারণ তার প্যারেন্ট থাকছে না
+        spam_comment = Comment(content='Spam', author=spammer, post=other_post)
+        db.session.add(spam_comment)
+        db.session.flush()
+        reply = Comment(content='Reply to spam', author=bob, post=other_post, parent_id=spam_comment.id)
+        under_post = Comment(content='On spam post', author=bob, post=post)
+        db.session.add_all([reply, under_post])
+        db.session.add(Vote(user_id=bob.id, post_id=post.id, vote_type='like'))
+        db.session.add(Vote(user_id=spammer.id, post_id=other_post.id, vote_type='like'))
+        spammer.add_notification('new_like', {'liker_username': 'bob', 'post_id': post.id, 'post_title': 'Spam'})
+        db.session.commit()
+        spammer_id, post_id = spammer.id, post.id
+        comment_ids = [spam_comment.id, reply.id, under_post.id]
+        users_before = _count(User)
+        bob_comments_before = _count(Comment, Comment.author_id == bob.id)
+
+        counts = purge_users([spammer_id])
+
+        assert counts == {'votes': 2, 'comments': 3, 'notifications': 1, 'posts': 1, 'users': 1}
+        assert db.session.get(User, spammer_id) is None
+        assert db.session.get(Post, post_id) is None
+        assert _count(Comment, Comment.id.in_(comment_ids)) == 0
+        assert _count(Vote, Vote.post_id == post_id) == 0
+        assert _count(Notification, Notification.user_id == spammer_id) == 0
+        assert _count(User) == users_before - 1
+        assert _count(Comment, Comment.author_id == bob.id) == bob_comments_before - 2
+
+
+def test_purge_users_with_no_ids_does_nothing(app):
+    with app.app_context():
+        assert purge_users([]) == {}
+
+
+def _reply_chain(post_id, author_id, depth):
+    comment_table = Comment.__table__
+    db.session.execute(comment_table.insert(), [
+        {'content': 'Reply', 'author_id': author_id, 'post_id': post_id, 'created_at': datetime(2024, 1, 1)}
+    ])
+    root_id = db.session.scalar(select(func.max(Comment.id)))
+    db.session.execute(comment_table.insert(), [
+        {'id': root_id + i, 'content': 'Reply', 'author_id': author_id, 'post_id': post_id,
+         'parent_id': root_id + i - 1, 'created_at': datetime(2024, 1, 1)}
+        for i in range(1, depth)
+    ])
+    db.session.commit()
+    return root_id
+
+
+def test_delete_posts_with_deep_reply_chain(app):
+    # cascade দিয়ে মুছলে ~1000 স্তরের পরে "too many levels of trigger recursion" হত
+    with app.app_context():
+        bob = db.session.scalar(select(User).where(User.username == 'bob'))
+        post = Post(title='Long thread', content='Lorem', author=bob, category_id=1)
+        db.session.add(post)
+        db.session.commit()
+        post_id = post.id
+        _reply_chain(post_id, bob.id, 2000)
+
+        assert delete_posts([post_id]) == 1
+        assert db.session.get(Post, post_id) is None
+        assert _count(Comment, Comment.post_id == post_id) == 0
+
+
+def test_delete_comments_removes_reply_tree(app):
+    with app.app_context():
+        post_id = db.session.scalar(select(Post.id).order_by(Post.id))
+        author_id = db.session.scalar(select(User.id).where(User.username == 'alice'))
+        root_id = _reply_chain(post_id, author_id, 1500)
+        comments_before = _count(Comment)
+
+        assert delete_comments([root_id]) == 1500
+        assert _count(Comment) == comments_before - 1500
+        assert _count(Comment, Comment.id >= root_id) == 0
@@ -0,0 +1,95 @@
+import threading
+from types import SimpleNamespace
+
+from werkzeug.security import generate_password_hash
+
+from app import db, password_hasher, passwords, user_cache
+from app.models import User
+from app.passwords import PasswordHasher
+
+OLD_METHOD = 'pbkdf2:sha256:1000'
+
+
+def _old_user(app, username):
+    with app.app_context():
+        user = User(username=username, email=f'{username}@example.com', confirmed=True,
+                    password_hash=generate_password_hash('secret', OLD_METHOD))
+        db.session.add(user)
+        db.session.commit()
+        return user.id, user.password_hash
+
+
+def _password_hash(app, user_id):
+    with app.app_context():
+        return db.session.get(User, user_id).password_hash
+
+
+def _hasher(method, threads=0):
+    hasher = PasswordHasher()
+    hasher.init_app(SimpleNamespace(config={'PASSWORD_HASH_METHOD': method, 'PASSWORD_HASH_THREADS': threads}))
+    return hasher
+
+
+def test_old_hash_still_verifies(app):
+    user_id, _ = _old_user(app, 'oldhash')
+    with app.app_context():
+        user = db.session.get(User, user_id)
+        assert user.check_password('secret')
+        assert not user.check_password('wrong')
+        assert password_hasher.needs_rehash(user.password_hash)
+
+
+def test_login_rehashes_with_configured_method(app, client):
+    user_id, old_hash = _old_user(app, 'rehashed')
+    user_cache.set(user_id, {'username': 'rehashed'})
+    # লগইনের রেট লিমিট অন্য টেস্টের সাথে শেয়ার না হওয়ার জন্য আলাদা IP
+    client.environ_base['REMOTE_ADDR'] = '10.0.35.1'
+
+    response = client.post('/auth/login', data={'username': 'rehashed', 'password': 'secret'})
+    assert response.status_code == 302 and '/auth/login' not in response.headers['Location']
+
+    new_hash = _password_hash(app, user_id)
+    assert new_hash != old_hash
+    assert new_hash.startswith(app.config['PASSWORD_HASH_METHOD'] + '$')
+    assert not password_hasher.needs_rehash(new_hash)
+    assert user_cache.get(user_id) is None
+
+
+def test_failed_login_keeps_old_hash(app, client):
+    user_id, old_hash = _old_user(app, 'notrehashed')
+    user_cache.set(user_id, {'username': 'notrehashed'})
+    client.environ_base['REMOTE_ADDR'] = '10.0.35.2'
+
+    response = client.post('/auth/login', data={'username': 'notrehashed', 'password': 'wrong'})
+    assert response.status_code == 302 and response.headers['Location'].endswith('/auth/login')
+
+    assert _password_hash(app, user_id) == old_hash
+    assert user_cache.get(user_id) == {'username': 'notrehashed'}
+
+
+def test_short_method_name_does_not_need_rehash():
+    # 'scrypt' নিজে কোনো হ্যাশের prefix নয়; Werkzeug 'scrypt:32768:8:1' লেখে
+    hasher = _hasher('scrypt')
+    assert not hasher.needs_rehash(hasher.hash('secret'))
+    assert hasher.needs_rehash(generate_password_hash('secret', OLD_METHOD))
+    assert not hasher.needs_rehash(None)
+
+
+def test_hashing_runs_in_thread_pool(monkeypatch):
+    hasher = _hasher(OLD_METHOD, threads=2)
+    threads = []
+
+    def record(func):
+        def wrapper(*args):
+            threads.append(threading.current_thread().name)
+            return func(*args)
+        return wrapper
+
+    monkeypatch.setattr(passwords, 'generate_password_hash', record(passwords.generate_password_hash))
+    monkeypatch.setattr(passwords, 'check_password_hash', record(passwords.check_password_hash))
+    try:
+        assert hasher.verify(hasher.hash('secret'), 'secret')
+    finally:
+        hasher._executor.shutdown()
+    assert len(threads) == 2
+    assert all(name.startswith('password-hash') for name in threads)
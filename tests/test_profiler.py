@@ -0,0 +1,62 @@
+import os
+
+import pytest
+
+from app import profiler
+
+
+@pytest.fixture()
+def profile_dir(tmp_path, monkeypatch):
+    directory = tmp_path / 'profiles'
+    monkeypatch.setattr(profiler, 'directory', str(directory))
+    return directory
+
+
+def _saved(directory):
+    return sorted(os.listdir(directory)) if directory.exists() else []
+
+
+@pytest.mark.parametrize('as_user', [None, 'alice'])
+def test_only_admins_are_profiled(client, login, profile_dir, as_user):
+    if as_user:
+        login(as_user)
+    for response in (client.get('/?_profile=1'), client.get('/', headers={'X-Profile': '1'})):
+        assert response.status_code == 200
+        assert 'X-Profile-Id' not in response.headers
+    assert _saved(profile_dir) == []
+
+
+def test_admin_request_is_profiled(client, admin, profile_dir):
+    admin()
+    response = client.get('/?_profile=1')
+    profile_id = response.headers['X-Profile-Id']
+    assert _saved(profile_dir) == [profile_id + suffix for suffix in ('.collapsed', '.json', '.prof')]
+
+    meta = profiler.profiles()[0]
+    assert meta['id'] == profile_id and meta['endpoint'] == 'main.index' and meta['user'] == 'admin'
+
+    assert 'X-Profile-Id' in client.get('/', headers={'X-Profile': '1'}).headers
+    assert 'X-Profile-Id' not in client.get('/').headers
+    assert len(profiler.profiles()) == 2
+
+
+def test_download(client, admin, profile_dir):
+    admin()
+    profile_id = client.get('/?_profile=1').headers['X-Profile-Id']
+
+    response = client.get(f'/admin/profiles/{profile_id}/pstats')
+    assert response.status_code == 200
+    assert response.get_data() == (profile_dir / f'{profile_id}.prof').read_bytes()
+    response.close()
+    assert client.get(f'/admin/profiles/{profile_id}/json').status_code == 404
+    for bad_id in ('..', f'{profile_id}.json', '..%2F..%2Fconfig', f'..%5C{profile_id}'):
+        assert client.get(f'/admin/profiles/{bad_id}/pstats').status_code == 404
+
+
+def test_old_profiles_are_pruned(app, client, admin, profile_dir, monkeypatch):
+    monkeypatch.setitem(app.config, 'PROFILER_KEEP', 2)
+    admin()
+    ids = [client.get('/?_profile=1').headers['X-Profile-Id'] for _ in range(4)]
+    assert [meta['id'] for meta in profiler.profiles()] == ids[:1:-1]
+    assert _saved(profile_dir) == sorted(f'{profile_id}{suffix}' for profile_id in ids[2:]
+                                         for suffix in ('.collapsed', '.json', '.prof'))
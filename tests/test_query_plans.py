@@ -0,0 +1,99 @@
+"""EXPLAIN QUERY PLAN regression tests for the hot request paths.
+
+Every statement a request sends to the database is captured and explained
+again; the test fails if SQLite has to fall back to a full table scan or a
+temporary sort on one of the large tables.
+"""
+import re
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+from app import db
+from app.models import Comment, Post
+
+HOT_TABLES = ('post', 'comment', 'vote', 'notification')
+FULL_SCAN = re.compile(r'^SCAN (%s)$' % '|'.join(HOT_TABLES))
+TEMP_SORT = 'USE TEMP B-TREE FOR ORDER BY'
+
+
+@contextmanager
+def captured_statements(engine):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE')):
+            statements.append((statement, parameters))
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def plan_problems(engine, statements):
+    problems = []
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            rows = conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).all()
+            for row in rows:
+                detail = row[-1]
+                uses_hot_table = any(re.search(rf'\b{table}\b', statement) for table in HOT_TABLES)
+                if FULL_SCAN.match(detail) or (detail.startswith(TEMP_SORT) and uses_hot_table):
+                    problems.append(f'{detail}\n    {" ".join(statement.split())}')
+    return problems
+
+
+@pytest.fixture()
+def post_id(app):
+    with app.app_context():
+        return db.session.scalar(
+            db.select(Post.id).join(Comment, Comment.post_id == Post.id).order_by(Post.id)
+        )
+
+
+@pytest.mark.parametrize('url', [
+    '/',
+    '/index?category_id=all_stories',
+    '/index?category_id=2&page=2',
+    '/user/alice',
+])
+def test_anonymous_pages_use_indexes(client, engine, url):
+    with captured_statements(engine) as statements:
+        response = client.get(url)
+    assert response.status_code == 200
+    assert statements
+    assert plan_problems(engine, statements) == []
+
+
+def test_post_detail_uses_indexes(client, engine, post_id):
+    with captured_statements(engine) as statements:
+        response = client.get(f'/post/{post_id}')
+    assert response.status_code == 200
+    assert plan_problems(engine, statements) == []
+
+
+def test_notifications_use_indexes(client, engine, login):
+    login('alice')
+    with captured_statements(engine) as statements:
+        response = client.get('/notifications')
+    assert response.status_code == 200
+    assert plan_problems(engine, statements) == []
+
+
+def test_vote_uses_indexes(client, engine, login, post_id):
+    login('alice')
+    with captured_statements(engine) as statements:
+        response = client.post(f'/vote/{post_id}/like')
+    assert response.status_code == 200
+    assert plan_problems(engine, statements) == []
+
+
+def test_comment_uses_indexes(client, engine, login, post_id):
+    login('alice')
+    with captured_statements(engine) as statements:
+        response = client.post(f'/post/{post_id}', data={'content': 'Nice post'})
+    assert response.status_code == 200
+    assert plan_problems(engine, statements) == []
@@ -0,0 +1,59 @@
+import pytest
+
+from app.ratelimit import MemoryBackend, Policy, SQLiteBackend
+
+
+def test_policy_parse():
+    assert Policy.parse('30/minute') == Policy(capacity=30, rate=0.5)
+    assert Policy.parse('5 / hours') == Policy(capacity=5, rate=5 / 3600)
+    with pytest.raises(ValueError):
+        Policy.parse('5/fortnight')
+
+
+@pytest.mark.parametrize('backend', ['memory', 'sqlite'])
+def test_bucket_allows_burst_then_waits(backend, tmp_path):
+    store = MemoryBackend() if backend == 'memory' else SQLiteBackend(str(tmp_path / 'ratelimit.db'))
+    policy = Policy.parse('3/minute')
+    assert [store.hit('client', policy) for _ in range(3)] == [0.0, 0.0, 0.0]
+    # একটি টোকেন ফেরত আসতে ২০ সেকেন্ড লাগে
+    assert store.hit('client', policy) == pytest.approx(20, abs=0.5)
+    assert store.hit('other-client', policy) == 0.0
+
+
+def test_sqlite_backend_is_shared_between_workers(tmp_path):
+    path = str(tmp_path / 'ratelimit.db')
+    policy = Policy.parse('2/minute')
+    first, second = SQLiteBackend(path), SQLiteBackend(path)
+    assert first.hit('client', policy) == 0.0
+    assert second.hit('client', policy) == 0.0
+    assert first.hit('client', policy) > 0
+
+
+def test_login_returns_429_with_retry_after(client):
+    client.environ_base['REMOTE_ADDR'] = '10.0.34.1'
+    data = {'email': 'nobody@example.com', 'password': 'wrong'}
+    statuses = [client.post('/auth/login', data=data).status_code for _ in range(10)]
+    assert 429 not in statuses
+
+    response = client.post('/auth/login', data=data)
+    assert response.status_code == 429
+    assert 1 <= int(response.headers['Retry-After']) <= 6
+
+    # GET কখনো গোনা হয় না
+    assert client.get('/auth/login').status_code == 200
+    # অন্য IP এর নিজস্ব বাকেট
+    client.environ_base['REMOTE_ADDR'] = '10.0.34.2'
+    assert client.post('/auth/login', data=data).status_code != 429
+
+
+def test_ajax_requests_get_json_429(client):
+    client.environ_base['REMOTE_ADDR'] = '10.0.34.3'
+    headers = {'X-Requested-With': 'XMLHttpRequest'}
+    for _ in range(5):
+        client.post('/reset_password', data={'email': 'nobody@example.com'}, headers=headers)
+
+    response = client.post('/reset_password', data={'email': 'nobody@example.com'}, headers=headers)
+    assert response.status_code == 429
+    assert response.get_json() == {'status': 'error', 'message': 'rate_limited',
+                                   'retry_after': int(response.headers['Retry-After'])}
+    assert 700 <= int(response.headers['Retry-After']) <= 720
@@ -0,0 +1,59 @@
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+
+from app import db
+from app.models import Post, User
+from app.moderation import delete_posts
+from app.suggest import SuggestIndex, normalize, suggest_index
+
+
+def test_normalize():
+    assert normalize('  Ｍy   Black\tCAT ') == 'my black cat'
+
+
+def test_suggest_endpoint(client):
+    response = client.get('/search/suggest?q=ALI')
+    assert response.status_code == 200
+    assert response.get_json()['users'] == [{'username': 'alice', 'url': '/user/alice'}]
+    assert response.cache_control.public and response.cache_control.max_age == 60
+
+    posts = client.get('/search/suggest?q=post').get_json()['posts']
+    # নতুন পোস্ট আগে, SUGGEST_LIMIT পর্যন্ত
+    post_ids = [int(post['url'].rsplit('/', 1)[1]) for post in posts]
+    assert len(post_ids) == 5 and post_ids == sorted(post_ids, reverse=True)
+    assert client.get('/search/suggest?q=post 3').get_json()['posts'][0]['title'] == 'Post 3'
+    assert client.get('/search/suggest?q=hor').get_json()['categories'][0]['name'] == 'Horror'
+    assert client.get('/search/suggest?q=').get_json()['posts'] == []
+
+
+def test_index_follows_commits(app):
+    with app.app_context():
+        suggest_index.lookup('warm', 5)
+        author_id = db.session.scalar(select(User.id).where(User.username == 'bob'))
+        post = Post(title='My black cat', content='Meow', author_id=author_id, category_id=1)
+        db.session.add(post)
+        db.session.commit()
+        post_id = post.id
+
+        # শিরোনামের পরের শব্দ দিয়েও পাওয়া যায়
+        assert suggest_index.lookup('blac', 5)['post'] == [(post_id, 'My black cat')]
+        assert suggest_index.lookup('cat', 5)['post'] == [(post_id, 'My black cat')]
+
+        post.title = 'My white cat'
+        db.session.commit()
+        assert suggest_index.lookup('black', 5)['post'] == []
+        assert suggest_index.lookup('whi', 5)['post'] == [(post_id, 'My white cat')]
+
+        delete_posts([post_id])
+        assert suggest_index.lookup('cat', 5)['post'] == []
+
+
+def test_lookup_without_tables_returns_nothing(app, monkeypatch):
+    index = SuggestIndex()
+    index.app = app
+
+    def rebuild():
+        raise OperationalError('SELECT', {}, Exception('no such table: category'))
+    monkeypatch.setattr(index, 'rebuild', rebuild)
+    with app.app_context():
+        assert index.lookup('post', 5) == {'post': [], 'user': [], 'category': []}
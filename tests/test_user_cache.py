@@ -0,0 +1,27 @@
+import io
+
+from app import user_cache
+
+
+def test_loader_caches_logged_in_user(client, login):
+    user = login('alice')
+    user_cache.invalidate(user.id)
+    client.get('/')
+    assert user_cache.get(user.id)['username'] == 'alice'
+
+
+def test_edit_profile_invalidates_cached_user(client, login):
+    user = login('bob')
+    client.get('/')
+    assert user_cache.get(user.id)['bio'] != 'Updated bio'
+
+    # ব্রাউজারের মতো খালি ফাইল ফিল্ডসহ পাঠানো হয়
+    response = client.post('/edit_profile', content_type='multipart/form-data', data={
+        'username': 'bob', 'bio': 'Updated bio', 'telegram_username': '', 'profile_picture': (io.BytesIO(), ''),
+    })
+    assert response.status_code == 302
+    assert user_cache.get(user.id) is None
+
+    # পরের রিকোয়েস্ট ডাটাবেস থেকে নতুন কপি পড়ে
+    client.get('/')
+    assert user_cache.get(user.id)['bio'] == 'Updated bio'